@@ -0,0 +1,153 @@
+"""
+Availability for DrAivBot planner
+Common free time of several company users
+
+Busy intervals of all participants come from one bulk query
+(get_events_for_users). They are sorted once and merged in a single sweep,
+the gaps between merged intervals are the common free slots: O(n log n)
+for n events, however many participants.
+
+Usage:
+    from bot.core.availability import find_free_slots
+
+    slots = await find_free_slots(
+        company_id, [alice_id, bob_id],
+        start, start + timedelta(days=7),
+        min_duration=timedelta(minutes=30),
+        working_hours=(time(9), time(18)), timezone="Europe/Moscow"
+    )
+    # [(datetime, datetime), ...]
+"""
+from datetime import datetime, time, timedelta
+from typing import Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from bot.core.database import get_events_for_users
+
+Interval = Tuple[datetime, datetime]
+
+# Events starting this long before the window are still fetched (they may
+# run into it); longer events are not expected in a planner
+MAX_EVENT_DURATION = timedelta(days=1)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """
+    Union of intervals (sort + sweep)
+
+    Returns:
+        Disjoint intervals in start order; touching intervals are joined
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_slots(
+    busy: Iterable[Interval],
+    start: datetime,
+    end: datetime,
+    min_duration: timedelta = timedelta(0)
+) -> List[Interval]:
+    """
+    Gaps between busy intervals within [start, end)
+
+    Args:
+        busy: Busy intervals (any order, may overlap)
+        start: Window start
+        end: Window end
+        min_duration: Shorter gaps are dropped
+
+    Returns:
+        Free intervals in start order
+    """
+    slots: List[Interval] = []
+    cursor = start
+    for busy_start, busy_end in merge_intervals(busy):
+        if busy_end <= cursor:
+            continue
+        if busy_start >= end:
+            break
+        if busy_start - cursor >= max(min_duration, timedelta.resolution):
+            slots.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    if end - cursor >= max(min_duration, timedelta.resolution):
+        slots.append((cursor, end))
+    return slots
+
+
+def off_hours(start: datetime, end: datetime, working_hours: Tuple[time, time], timezone: str) -> List[Interval]:
+    """
+    Intervals outside daily working hours within [start, end) (as busy time)
+
+    Args:
+        working_hours: (from, to) local times; to < from is a shift crossing
+            midnight, e.g. (time(22), time(6))
+
+    Raises:
+        ValueError: from == to
+    """
+    day_start, day_end = working_hours
+    if day_start == day_end:
+        raise ValueError(f"Empty working hours: {day_start}-{day_end}")
+
+    zone = ZoneInfo(timezone)
+    overnight = day_end < day_start
+    busy: List[Interval] = []
+    # An overnight shift of the previous day may run into the window
+    day = start.astimezone(zone).date() - timedelta(days=1 if overnight else 0)
+    last_day = end.astimezone(zone).date()
+    previous_end = start
+    while day <= last_day:
+        opens = datetime.combine(day, day_start, zone)
+        closes = datetime.combine(day + timedelta(days=1 if overnight else 0), day_end, zone)
+        busy.append((previous_end, opens))
+        previous_end = closes
+        day += timedelta(days=1)
+    busy.append((previous_end, end))
+    return [(busy_start, busy_end) for busy_start, busy_end in busy if busy_end > busy_start]
+
+
+async def find_free_slots(
+    company_id: Optional[str],
+    user_ids: Iterable[str],
+    start: datetime,
+    end: datetime,
+    min_duration: timedelta = timedelta(minutes=30),
+    working_hours: Optional[Tuple[time, time]] = None,
+    timezone: str = "UTC"
+) -> List[Interval]:
+    """
+    Slots in [start, end) when all users are free
+
+    Args:
+        company_id: Only the company's events count (None = all events)
+        user_ids: Participants (user UUIDs)
+        start: Window start (timezone-aware)
+        end: Window end
+        min_duration: Minimum slot length
+        working_hours: Daily (from, to) local times; outside is busy
+            (to < from: shift crossing midnight)
+        timezone: Zone of working_hours
+
+    Returns:
+        Common free slots in start order
+
+    Raises:
+        ValueError: Empty working hours (from == to)
+    """
+    busy = off_hours(start, end, working_hours, timezone) if working_hours else []
+
+    events = await get_events_for_users(user_ids, start - MAX_EVENT_DURATION, end, company_id)
+    busy.extend(
+        (event["event_date"], event["event_date"] + timedelta(minutes=event["duration_minutes"] or 0))
+        for user_events in events.values()
+        for event in user_events
+    )
+
+    return free_slots(busy, start, end, min_duration)
@@ -0,0 +1,89 @@
+"""
+Benchmark: parse overhead of the hot queries with and without named prepared statements
+
+Runs get_user_by_telegram_id's SELECT and the session get-or-create / write
+statements on one connection, first with asyncpg's statement cache disabled
+(unnamed statement: Parse + Describe on every call, what the transaction pooler
+needs), then with it enabled (named statement parsed once per connection).
+
+Run from the project root against a session-mode endpoint (direct connection
+or the session pooler on port 5432):
+    SUPABASE_DB_URL=postgresql://... python bench_db_statements.py [iterations]
+
+Writes only to the session row of a reserved telegram_id, deleted at the end.
+"""
+import asyncio
+import json
+import sys
+import time
+
+import asyncpg
+
+sys.path.insert(0, '.')
+
+from bot.core.database import DATABASE_URL, detect_pool_mode  # noqa: E402
+from bot.core.session import _GET_OR_CREATE_QUERY, _WRITE_QUERY  # noqa: E402
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+BENCH_TELEGRAM_ID = -424242  # never a real Telegram user
+
+USER_QUERY = """
+    SELECT id, telegram_id, username, full_name, company_id, language, timezone
+    FROM users
+    WHERE telegram_id = $1
+"""
+
+HOT_QUERIES = [
+    ("get_user_by_telegram_id", "fetchrow", USER_QUERY, (BENCH_TELEGRAM_ID,)),
+    ("session get-or-create", "fetchrow", _GET_OR_CREATE_QUERY, (BENCH_TELEGRAM_ID,)),
+    ("session write (patch)", "fetchrow", _WRITE_QUERY,
+     (BENCH_TELEGRAM_ID, "MENU", None, [], json.dumps({"bench": 1}), None, None)),
+]
+
+
+async def run(statement_cache_size: int) -> dict:
+    conn = await asyncpg.connect(DATABASE_URL, statement_cache_size=statement_cache_size)
+    results = {}
+    try:
+        for name, method, query, args in HOT_QUERIES:
+            call = getattr(conn, method)
+            await call(query, *args)  # warm-up (creates the bench session row)
+            started = time.perf_counter()
+            for _ in range(ITERATIONS):
+                await call(query, *args)
+            results[name] = (time.perf_counter() - started) / ITERATIONS * 1e3
+    finally:
+        await conn.close()
+    return results
+
+
+async def cleanup():
+    conn = await asyncpg.connect(DATABASE_URL, statement_cache_size=0)
+    try:
+        await conn.execute("DELETE FROM sessions WHERE telegram_id = $1", BENCH_TELEGRAM_ID)
+    finally:
+        await conn.close()
+
+
+async def main():
+    mode = detect_pool_mode(DATABASE_URL)
+    print(f"Endpoint pooling mode: {mode}, iterations: {ITERATIONS}\n")
+    if mode == "transaction":
+        print("⚠️ Named statements are unsafe behind the transaction pooler: "
+              "point SUPABASE_DB_URL at a session-mode endpoint\n")
+
+    try:
+        unnamed = await run(statement_cache_size=0)
+        named = await run(statement_cache_size=256)
+    finally:
+        await cleanup()
+
+    print(f"{'query':<26} {'unnamed':>10} {'named':>10} {'saved':>10}")
+    for name in unnamed:
+        saved = unnamed[name] - named[name]
+        print(f"{name:<26} {unnamed[name]:8.3f}ms {named[name]:8.3f}ms {saved:8.3f}ms "
+              f"({saved / unnamed[name] * 100:4.1f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""
+Benchmark: Redis value codecs (JSON vs msgpack)
+Compares encode/decode cost and payload size on a typical session
+
+Run from the project root:
+    python bench_redis_codec.py
+"""
+import sys
+import timeit
+import uuid
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, '.')
+
+from bot.core.redis_codec import JsonCodec, get_codec  # noqa: E402
+
+ITERATIONS = 20000
+
+SESSION = {
+    "id": uuid.uuid4(),
+    "telegram_id": 123456789,
+    "user_id": str(uuid.uuid4()),
+    "company_id": str(uuid.uuid4()),
+    "state": "ANALYSIS",
+    "data": {
+        "lang": "ru",
+        "step": "company_name",
+        "event_creation": {"title": "Планёрка", "duration": 60, "reminder": 15},
+        "analysis_progress": {"block": 3, "question_index": 5, "answers": ["да", "нет", "частично"] * 5}
+    },
+    "expires_at": datetime.now(timezone.utc) + timedelta(hours=24)
+}
+
+# Single hash field, as stored per key in the session hash layout
+FIELD = "ru"
+
+
+def bench(name, codec, value):
+    encoded = codec.encode(value)
+    encode_us = timeit.timeit(lambda: codec.encode(value), number=ITERATIONS) / ITERATIONS * 1e6
+    decode_us = timeit.timeit(lambda: codec.decode(encoded), number=ITERATIONS) / ITERATIONS * 1e6
+    roundtrip = codec.decode(encoded)
+    line = f"{name:<22} {len(encoded):>6} B   encode {encode_us:7.2f} µs   decode {decode_us:7.2f} µs"
+    if isinstance(roundtrip, dict) and "expires_at" in roundtrip:
+        line += f"   expires_at → {type(roundtrip['expires_at']).__name__}"
+    print(line)
+
+
+if __name__ == "__main__":
+    print(f"Iterations: {ITERATIONS}\n")
+    print("Whole session:")
+    bench("json (legacy)", JsonCodec(), SESSION)
+    bench("msgpack (headered)", get_codec("msgpack"), SESSION)
+
+    print("\nSingle hash field:")
+    bench("json (legacy)", JsonCodec(), FIELD)
+    bench("msgpack (headered)", get_codec("msgpack"), FIELD)
@@ -26,9 +26,65 @@ if not SUPABASE_URL or not SUPABASE_ANON_KEY:
 # Database Configuration (async connection string)
 DATABASE_URL = f"postgresql+asyncpg://postgres.lilkhrrocptlthoxfmen:{os.getenv('SUPABASE_SERVICE_ROLE_KEY', '')}@aws-0-us-east-1.pooler.supabase.com:6543/postgres"
 
+# asyncpg pool (bot/core/database.py)
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "auto").lower()  # auto (port 6543 → transaction) | transaction | session
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))  # named statements, session mode only
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "5"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+DB_COMMAND_TIMEOUT = float(os.getenv("DB_COMMAND_TIMEOUT", "30"))  # seconds per query
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "10"))  # seconds per new connection
+DB_MAX_INACTIVE_LIFETIME = float(os.getenv("DB_MAX_INACTIVE_LIFETIME", "300"))  # idle connections closed after
+DB_BATCH_WINDOW_MS = float(os.getenv("DB_BATCH_WINDOW_MS", "0"))  # batch point lookups (0 = same loop tick)
+DB_BATCH_MAX_SIZE = int(os.getenv("DB_BATCH_MAX_SIZE", "100"))  # keys per batched lookup
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "500"))  # log queries slower than this
+DB_WARMUP_COMPANIES = int(os.getenv("DB_WARMUP_COMPANIES", "50"))  # positions preloaded at startup (0 = off)
+DB_CLOSE_TIMEOUT = float(os.getenv("DB_CLOSE_TIMEOUT", "10"))  # seconds to drain the pool on shutdown
+DB_EVENTS_PAGE_SIZE = int(os.getenv("DB_EVENTS_PAGE_SIZE", "500"))  # rows per page when streaming events
+if DB_EVENTS_PAGE_SIZE < 1:
+    raise ValueError("DB_EVENTS_PAGE_SIZE must be at least 1")
+
 # Redis Configuration (optional - graceful fallback to Supabase only)
 REDIS_URL = os.getenv("REDIS_URL")  # Format: redis://host:port/db or redis://password@host:port/db
 ENABLE_REDIS_CACHE = os.getenv("ENABLE_REDIS_CACHE", "true").lower() == "true"
+# Several nodes (comma-separated) → keys sharded by consistent hashing; defaults to REDIS_URL
+REDIS_URLS = [url.strip() for url in os.getenv("REDIS_URLS", REDIS_URL or "").split(",") if url.strip()]
+REDIS_VIRTUAL_NODES = int(os.getenv("REDIS_VIRTUAL_NODES", "160"))  # ring points per node
+REDIS_CODEC = os.getenv("REDIS_CODEC", "msgpack").lower()  # msgpack | json (readers accept both)
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0"))  # seconds per command
+REDIS_FAILURE_THRESHOLD = int(os.getenv("REDIS_FAILURE_THRESHOLD", "3"))  # errors within 10s → circuit opens
+REDIS_RECONNECT_MAX_BACKOFF = float(os.getenv("REDIS_RECONNECT_MAX_BACKOFF", "30"))  # seconds
+
+# Session write mode:
+# - "sync": every update is written to Supabase, then written through to Redis
+# - "deferred": Redis is updated immediately, Supabase writes are coalesced per flush window
+SESSION_WRITE_MODE = os.getenv("SESSION_WRITE_MODE", "sync").lower()
+SESSION_FLUSH_INTERVAL = float(os.getenv("SESSION_FLUSH_INTERVAL", "2.0"))  # seconds
+SESSION_FLUSH_MAX_PENDING = int(os.getenv("SESSION_FLUSH_MAX_PENDING", "1000"))  # flush early above this
+
+# Expired session cleanup (Supabase): rows deleted per batch/transaction
+SESSION_CLEANUP_BATCH_SIZE = int(os.getenv("SESSION_CLEANUP_BATCH_SIZE", "1000"))
+if SESSION_CLEANUP_BATCH_SIZE < 1:
+    raise ValueError("SESSION_CLEANUP_BATCH_SIZE must be at least 1")
+
+# Process-local L1 session cache in front of Redis (kept coherent via pub/sub invalidation)
+SESSION_LOCAL_CACHE_ENABLED = os.getenv("SESSION_LOCAL_CACHE_ENABLED", "false").lower() == "true"
+SESSION_LOCAL_CACHE_SIZE = int(os.getenv("SESSION_LOCAL_CACHE_SIZE", "10000"))  # entries (LRU)
+SESSION_LOCAL_CACHE_TTL = float(os.getenv("SESSION_LOCAL_CACHE_TTL", "30"))  # seconds, bounds staleness
+
+# Prometheus exporter (GET /metrics), disabled if unset
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0")) or None
+
+# Recurring events (needs the recurrence_* columns, see bot/core/recurrence.py)
+RECURRENCE_ENABLED = os.getenv("RECURRENCE_ENABLED", "false").lower() == "true"
+
+# Event reminders (needs the reminder_* columns, see bot/core/reminders.py)
+REMINDERS_ENABLED = os.getenv("REMINDERS_ENABLED", "false").lower() == "true"
+REMINDER_WINDOW = float(os.getenv("REMINDER_WINDOW", "300"))  # seconds ahead claimed per poll
+REMINDER_POLL_INTERVAL = float(os.getenv("REMINDER_POLL_INTERVAL", "60"))  # seconds between claims
+REMINDER_CLAIM_BATCH_SIZE = int(os.getenv("REMINDER_CLAIM_BATCH_SIZE", "500"))
+REMINDER_SEND_CONCURRENCY = int(os.getenv("REMINDER_SEND_CONCURRENCY", "20"))  # parallel Telegram sends
+REMINDER_MAX_ATTEMPTS = int(os.getenv("REMINDER_MAX_ATTEMPTS", "3"))  # sends per reminder before giving up
+REMINDER_RETRY_BACKOFF = float(os.getenv("REMINDER_RETRY_BACKOFF", "30"))  # seconds, doubled per failed send
 
 # Directories
 REPORTS_DIR = "bot/data/reports"
@@ -36,7 +92,14 @@ RESPONSES_DIR = "bot/data/responses"
 
 # Bot Settings
 SESSION_TIMEOUT_HOURS = 24  # Sessions expire after 24 hours
+ORGCHART_CACHE_TTL = int(os.getenv("ORGCHART_CACHE_TTL", "3600"))  # positions/org chart cache (invalidated on writes)
 MAX_SESSION_DATA_SIZE = 10 * 1024  # 10KB max session data
+SIMPLE_SESSION_MAX_ENTRIES = int(os.getenv("SIMPLE_SESSION_MAX_ENTRIES", "100000"))  # In-memory store cap (LRU eviction)
+
+# In-memory session persistence (append-only log + snapshot), disabled if no directory
+SESSION_PERSIST_DIR = os.getenv("SESSION_PERSIST_DIR")
+SESSION_SNAPSHOT_INTERVAL = int(os.getenv("SESSION_SNAPSHOT_INTERVAL", "300"))  # seconds
+SESSION_PERSIST_FSYNC = os.getenv("SESSION_PERSIST_FSYNC", "everysec").lower()  # always | everysec | no
 DEFAULT_LANGUAGE = "ru"
 DEFAULT_TIMEZONE = "UTC"
 
@@ -0,0 +1,143 @@
+"""
+Batched lookups for DrAivBot (DataLoader pattern)
+Point lookups arriving within a short window are resolved by one bulk query
+
+Usage:
+    from bot.core.dataloader import BatchLoader
+
+    async def fetch_users(telegram_ids):          # one query for the whole batch
+        return await get_users_by_ids(telegram_ids)  # {telegram_id: user}
+
+    _user_loader = BatchLoader(fetch_users, "users")
+
+    user = await _user_loader.load(telegram_id)   # None if not found
+
+A key that is already waiting or in flight joins the existing lookup, so
+concurrent callers for the same key share one result object (copy mutable
+results). Nothing is cached once the batch is resolved.
+
+If a bulk query fails, its keys are retried one by one, so a single bad key
+(e.g. a malformed id) only fails its own callers.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+
+from bot.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_batch_sizes = REGISTRY.histogram(
+    "dataloader_batch_size", "Keys resolved per bulk query", ["loader"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+_batch_errors = REGISTRY.counter(
+    "dataloader_batch_errors_total", "Failed bulk queries", ["loader"]
+)
+_key_errors = REGISTRY.counter(
+    "dataloader_key_errors_total", "Keys still failing when loaded on their own", ["loader"]
+)
+
+
+class BatchLoader:
+    """
+    Collects keys for `window` seconds (or until `max_batch_size`), then runs
+    one `batch_fn(keys)` call for all of them
+
+    Args:
+        batch_fn: Coroutine taking a list of keys, returning {key: value}
+            (missing keys resolve to None)
+        name: Loader name (metrics label)
+        max_batch_size: Dispatch immediately once this many keys wait
+        window: Seconds to wait for more keys; 0 = end of the current
+            event-loop iteration
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        name: str,
+        max_batch_size: int = 100,
+        window: float = 0.0
+    ):
+        self.batch_fn = batch_fn
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._handle: Optional[asyncio.Handle] = None
+
+    async def load(self, key: Hashable) -> Any:
+        """
+        Resolve one key through the next batch
+
+        The shared lookup is shielded: a cancelled caller does not fail it
+        for the others.
+        """
+        future = self._pending.get(key) or self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._handle is None:
+                if self.window > 0:
+                    self._handle = loop.call_later(self.window, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Resolve several keys (batched together with any concurrent load())"""
+        keys = list(dict.fromkeys(keys))
+        values = await asyncio.gather(*(self.load(key) for key in keys))
+        return dict(zip(keys, values))
+
+    def _dispatch(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            self._inflight.update(batch)
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: Dict[Hashable, asyncio.Future]):
+        _batch_sizes.observe(len(batch), loader=self.name)
+        try:
+            results = await self.batch_fn(list(batch))
+        except Exception as e:
+            _batch_errors.inc(loader=self.name)
+            if len(batch) == 1:
+                self._fail(batch.values(), e)
+            else:
+                logger.warning(f"Batch load failed ({self.name}, {len(batch)} keys), retrying per key: {e}")
+                await asyncio.gather(*(self._run_one(key, future) for key, future in batch.items()))
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
+        finally:
+            for key, future in batch.items():
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    async def _run_one(self, key: Hashable, future: asyncio.Future):
+        """Fallback lookup of one key of a failed batch"""
+        try:
+            results = await self.batch_fn([key])
+        except Exception as e:
+            _key_errors.inc(loader=self.name)
+            self._fail((future,), e)
+        else:
+            if not future.done():
+                future.set_result(results.get(key))
+
+    @staticmethod
+    def _fail(futures: Iterable[asyncio.Future], error: Exception):
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+                future.exception()  # mark retrieved: waiters may all be gone
@@ -0,0 +1,88 @@
+"""
+Consistent hash ring for DrAivBot
+Routes cache keys to Redis nodes with minimal key movement
+
+Each node is placed on the ring at `vnodes` pseudo-random points; a key
+belongs to the first node point clockwise from the key's hash. Adding or
+removing a node only moves the keys between its points and their
+predecessors (~1/N of all keys), the rest stay where they are.
+
+Like Redis Cluster, a `{tag}` inside a key is hashed instead of the whole
+key, so `lock:{session:1}` and `session:1` can be kept on the same node.
+"""
+import hashlib
+from bisect import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_VNODES = 160
+
+
+def _hash(value: str) -> int:
+    """64-bit position on the ring (stable across processes and restarts)"""
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+def hash_key(key: str) -> int:
+    """Ring position of a cache key (honours `{hash tags}`)"""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            key = key[start + 1:end]
+    return _hash(key)
+
+
+class HashRing:
+    """
+    Consistent hashing with virtual nodes
+
+    Args:
+        nodes: Node names (stable identifiers, e.g. "host:port/db")
+        vnodes: Points per node (more points → more even distribution)
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = DEFAULT_VNODES):
+        self.vnodes = vnodes
+        self._nodes: Dict[str, List[int]] = {}
+        # Sorted ring: positions for bisect, owners in the same order
+        self._positions: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self._nodes[node] = self._node_positions(node)
+        self._rebuild()
+
+    def _node_positions(self, node: str) -> List[int]:
+        return [_hash(f"{node}#{i}") for i in range(self.vnodes)]
+
+    def _rebuild(self) -> None:
+        points: List[Tuple[int, str]] = sorted(
+            (position, node) for node, positions in self._nodes.items() for position in positions
+        )
+        self._positions = [position for position, _ in points]
+        self._owners = [node for _, node in points]
+
+    def add_node(self, node: str) -> None:
+        if node not in self._nodes:
+            self._nodes[node] = self._node_positions(node)
+            self._rebuild()
+
+    def remove_node(self, node: str) -> None:
+        if self._nodes.pop(node, None) is not None:
+            self._rebuild()
+
+    def get_node(self, key: str) -> Optional[str]:
+        """Node owning a key (None if the ring is empty)"""
+        if not self._positions:
+            return None
+        index = bisect(self._positions, hash_key(key))
+        return self._owners[index % len(self._owners)]
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
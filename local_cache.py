@@ -0,0 +1,128 @@
+"""
+Process-local L1 cache for DrAivBot
+Bounded LRU with TTL in front of Redis
+
+Coherence across bot instances comes from invalidation messages (see
+SessionManager): every write drops the key locally and publishes the key,
+other instances drop it on receipt. Fills that raced with an invalidation
+are rejected: take a token with begin_fill() before reading Redis and pass
+it to set().
+
+    token = cache.begin_fill(key)
+    value = await redis_read(key)
+    cache.set(key, value, token=token)   # no-op if key was invalidated meanwhile
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Bounded LRU + TTL cache (single event loop, no locking)
+
+    Args:
+        max_entries: LRU capacity
+        ttl: Seconds an entry stays valid (bounds staleness if an
+            invalidation message is lost)
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+
+        # Invalidation sequence: fills started before the key's last
+        # invalidation (or before the floor) are dropped
+        self._seq = 0
+        self._floor = 0
+        self._invalidated: Dict[Hashable, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def begin_fill(self, key: Hashable) -> int:
+        """Token for a fill that starts now"""
+        self._seq += 1
+        return self._seq
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> bool:
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value (stored as is; callers copy mutable values)
+            token: begin_fill() token; the fill is dropped if the key was
+                invalidated after it was taken
+
+        Returns:
+            True if stored
+        """
+        if token is not None and (token <= self._floor or token <= self._invalidated.get(key, 0)):
+            return False
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def peek(self, key: Hashable) -> Any:
+        """Current value without touching LRU order or stats (None if absent/expired)"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key and reject fills that started before now"""
+        self._entries.pop(key, None)
+        self._seq += 1
+        self._invalidated[key] = self._seq
+        if len(self._invalidated) > self.max_entries:
+            # Keep the marker map bounded: reject every older fill instead
+            self._invalidated.clear()
+            self._floor = self._seq
+
+    def clear(self) -> None:
+        """Drop everything (e.g. invalidation messages may have been missed)"""
+        self._entries.clear()
+        self._invalidated.clear()
+        self._seq += 1
+        self._floor = self._seq
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions
+        }
@@ -15,12 +15,20 @@ from aiogram import Bot, Dispatcher, types, F
 from aiogram.filters import Command
 from aiogram.types import BotCommand
 
-from bot.config import BOT_TOKEN, REDIS_URL, ENABLE_REDIS_CACHE
+from bot.config import (
+    BOT_TOKEN, REDIS_URLS, ENABLE_REDIS_CACHE, SESSION_PERSIST_DIR, METRICS_PORT, REMINDERS_ENABLED
+)
 # Temporary: Using simple in-memory sessions instead of database
 # from bot.core.database import get_user_by_telegram_id
 from bot.core.simple_session import SimpleSessionManager as SessionManager
+from bot.core.simple_session import init_session_persistence, close_session_persistence
 from bot.core.notifications import NotificationManager
 from bot.core.redis_cache import init_redis_cache, close_redis_cache
+from bot.core.database import init_database, close_pool
+from bot.core.session import close_session_writer, init_session_local_cache
+from bot.core.middleware import SessionMiddleware, SessionContext
+from bot.core.metrics import init_metrics_server, close_metrics_server
+from bot.core.reminders import init_reminder_scheduler, close_reminder_scheduler
 
 # Mock function for get_user_by_telegram_id
 async def get_user_by_telegram_id(telegram_id: int):
@@ -43,6 +51,10 @@ logger = logging.getLogger(__name__)
 bot = Bot(token=BOT_TOKEN)
 dp = Dispatcher()
 
+# Load session once per update (shared with module routers)
+dp.message.middleware(SessionMiddleware(SessionManager))
+dp.callback_query.middleware(SessionMiddleware(SessionManager))
+
 # Register module routers
 dp.include_router(company_router)
 
@@ -51,22 +63,17 @@ notifications = NotificationManager(bot)
 
 
 @dp.message(Command("start"))
-async def cmd_start(message: types.Message):
+async def cmd_start(message: types.Message, session: SessionContext):
     """Handle /start command"""
     telegram_id = message.from_user.id
 
-    # Initialize or get session
-    session = await SessionManager.get_session(telegram_id)
-
     # Detect user language
     user_lang = message.from_user.language_code or "ru"
     if user_lang not in ["ru", "en"]:
         user_lang = "ru"
 
     # Update session with language
-    data = session.get("data", {})
-    data["lang"] = user_lang
-    await SessionManager.update_session(telegram_id, data=data)
+    session.data["lang"] = user_lang
 
     # Check if user has invitation code in /start
     args = message.text.split(maxsplit=1)
@@ -82,12 +89,9 @@ async def cmd_start(message: types.Message):
 
     if user:
         # User already registered
-        await SessionManager.update_session(
-            telegram_id,
-            user_id=user["id"],
-            company_id=user["company_id"],
-            state="MENU"
-        )
+        session.user_id = user["id"]
+        session.company_id = user["company_id"]
+        session.state = "MENU"
 
         await message.answer(
             f"{get_text(user_lang, 'welcome')}\n\n{get_text(user_lang, 'menu_title')}\n{get_text(user_lang, 'menu_subtitle')}",
@@ -102,11 +106,9 @@ async def cmd_start(message: types.Message):
 
 
 @dp.message(Command("menu"))
-async def cmd_menu(message: types.Message):
+async def cmd_menu(message: types.Message, session: SessionContext):
     """Show main menu"""
-    telegram_id = message.from_user.id
-    session = await SessionManager.get_session(telegram_id)
-    lang = session.get("data", {}).get("lang", "ru")
+    lang = session.lang
 
     await message.answer(
         f"{get_text(lang, 'menu_title')}\n{get_text(lang, 'menu_subtitle')}",
@@ -115,13 +117,10 @@ async def cmd_menu(message: types.Message):
 
 
 @dp.callback_query(F.data == "back_to_menu")
-async def back_to_menu(callback: types.CallbackQuery):
+async def back_to_menu(callback: types.CallbackQuery, session: SessionContext):
     """Return to main menu"""
-    telegram_id = callback.from_user.id
-    session = await SessionManager.get_session(telegram_id)
-    lang = session.get("data", {}).get("lang", "ru")
-
-    await SessionManager.update_session(telegram_id, state="MENU")
+    lang = session.lang
+    session.state = "MENU"
 
     await callback.message.answer(
         f"{get_text(lang, 'menu_title')}\n{get_text(lang, 'menu_subtitle')}",
@@ -131,11 +130,9 @@ async def back_to_menu(callback: types.CallbackQuery):
 
 
 @dp.callback_query(F.data == "menu_settings")
-async def menu_settings(callback: types.CallbackQuery):
+async def menu_settings(callback: types.CallbackQuery, session: SessionContext):
     """Show settings menu"""
-    telegram_id = callback.from_user.id
-    session = await SessionManager.get_session(telegram_id)
-    lang = session.get("data", {}).get("lang", "ru")
+    lang = session.lang
 
     await callback.message.answer(
         get_text(lang, "choose_lang"),
@@ -145,16 +142,10 @@ async def menu_settings(callback: types.CallbackQuery):
 
 
 @dp.callback_query(F.data.startswith("lang_"))
-async def change_language(callback: types.CallbackQuery):
+async def change_language(callback: types.CallbackQuery, session: SessionContext):
     """Change user language"""
-    telegram_id = callback.from_user.id
     new_lang = callback.data.split("_")[1]
-
-    session = await SessionManager.get_session(telegram_id)
-    data = session.get("data", {})
-    data["lang"] = new_lang
-
-    await SessionManager.update_session(telegram_id, data=data)
+    session.data["lang"] = new_lang
 
     await callback.message.answer(
         f"{get_text(new_lang, 'lang_set')}: {'🇷🇺 Русский' if new_lang == 'ru' else '🇬🇧 English'}"
@@ -167,11 +158,9 @@ async def change_language(callback: types.CallbackQuery):
 
 
 @dp.callback_query(F.data.startswith("menu_"))
-async def menu_sections(callback: types.CallbackQuery):
+async def menu_sections(callback: types.CallbackQuery, session: SessionContext):
     """Handle menu section callbacks"""
-    telegram_id = callback.from_user.id
-    session = await SessionManager.get_session(telegram_id)
-    lang = session.get("data", {}).get("lang", "ru")
+    lang = session.lang
 
     section = callback.data.replace("menu_", "")
 
@@ -187,20 +176,18 @@ async def menu_sections(callback: types.CallbackQuery):
 
 
 @dp.message()
-async def handle_message(message: types.Message):
+async def handle_message(message: types.Message, session: SessionContext):
     """Handle text messages based on current state"""
-    telegram_id = message.from_user.id
-    session = await SessionManager.get_session(telegram_id)
     state = session.get("state", "MENU")
 
     # Company registration flow
     if state == "COMPANY_REGISTRATION":
         from bot.modules.company.handlers import process_company_name
-        await process_company_name(message)
+        await process_company_name(message, session)
         return
 
     # Default: redirect to menu
-    lang = session.get("data", {}).get("lang", "ru")
+    lang = session.lang
     await message.answer(
         f"{get_text(lang, 'menu_title')}\n{get_text(lang, 'menu_subtitle')}",
         reply_markup=get_main_menu(lang)
@@ -245,29 +232,48 @@ async def main():
     logger.info("🚀 Starting DrAivBot v2.0 (Modular Architecture)")
 
     # Initialize Redis cache (optional)
-    if ENABLE_REDIS_CACHE and REDIS_URL:
-        redis_cache = await init_redis_cache(REDIS_URL)
-        if redis_cache:
+    if ENABLE_REDIS_CACHE and REDIS_URLS:
+        redis_cache = await init_redis_cache(REDIS_URLS)
+        if redis_cache and redis_cache.is_connected():
             logger.info("✅ Redis cache enabled")
         else:
-            logger.warning("⚠️ Redis unavailable, using Supabase only")
+            logger.warning("⚠️ Redis unavailable, using Supabase only (reconnecting in background)")
+        # Process-local L1 in front of Redis (SESSION_LOCAL_CACHE_ENABLED)
+        await init_session_local_cache()
     else:
         logger.info("ℹ️ Redis cache disabled")
         await init_redis_cache(None)
 
+    # Open and warm the database pool (after Redis: preloaded data is cached there)
+    if not await init_database():
+        logger.warning("⚠️ Database not ready, connecting on first use")
+
+    # Restore in-memory sessions from disk (optional)
+    await init_session_persistence(SESSION_PERSIST_DIR)
+
+    # Prometheus scrape endpoint (optional)
+    await init_metrics_server(METRICS_PORT)
+
     # Set bot commands
     await set_bot_commands()
 
     # Start background tasks
     asyncio.create_task(cleanup_sessions())
+    if REMINDERS_ENABLED:
+        await init_reminder_scheduler(notifications)
 
     try:
         # Start polling
         logger.info("✅ Bot started successfully")
         await dp.start_polling(bot)
     finally:
-        # Cleanup on shutdown
+        # Cleanup on shutdown (flush deferred session writes while Redis is still up)
+        await close_reminder_scheduler()
+        await close_session_writer()
+        await close_session_persistence()
+        await close_pool()
         await close_redis_cache()
+        await close_metrics_server()
         logger.info("👋 Bot stopped")
 
 
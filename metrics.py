@@ -0,0 +1,272 @@
+"""
+Metrics for DrAivBot
+In-process counters, gauges and histograms with Prometheus text export
+
+Usage:
+    from bot.core.metrics import REGISTRY
+
+    rows = REGISTRY.counter("session_cleanup_rows_total", "Expired sessions removed")
+    rows.inc(42)
+
+    latency = REGISTRY.histogram("redis_latency_seconds", "Redis call latency", ["op"])
+    latency.observe(0.003, op="get")
+
+    text = REGISTRY.render_prometheus()
+
+    # Optional scrape endpoint: GET http://<host>:<port>/metrics
+    await init_metrics_server(9108)
+"""
+import logging
+from bisect import bisect_left
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Metric name prefix in exports
+NAMESPACE = "draivbot"
+
+# Default latency buckets (seconds): 0.5ms … 10s
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labelnames: Tuple[str, ...], labels: Dict[str, Any]) -> LabelKey:
+    """Normalize label values into a hashable, ordered key"""
+    return tuple((name, str(labels.get(name, ""))) for name in labelnames)
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(key) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    """Base class: name, description and label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(_label_key(self.labelnames, labels), 0)
+
+    def items(self) -> List[Tuple[LabelKey, float]]:
+        return list(self._values.items())
+
+    def render(self, full_name: str) -> List[str]:
+        return [f"{full_name}{_format_labels(key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self._values[_label_key(self.labelnames, labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Bucketed distribution per label set (count, sum, estimated quantiles)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label key -> [bucket counts..., +Inf count], sum
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(self.labelnames, labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside the bucket"""
+        counts = self._counts.get(_label_key(self.labelnames, labels))
+        if not counts:
+            return None
+        total = sum(counts)
+        if total == 0:
+            return None
+
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * ((rank - cumulative) / count)
+            cumulative += count
+        return self.buckets[-1]
+
+    def snapshot(self, **labels) -> Dict[str, Any]:
+        """Summary for one label set: count, sum, avg, p50/p95/p99"""
+        key = _label_key(self.labelnames, labels)
+        counts = self._counts.get(key)
+        total = sum(counts) if counts else 0
+        total_sum = self._sums.get(key, 0.0)
+        return {
+            "count": total,
+            "sum": total_sum,
+            "avg": total_sum / total if total else None,
+            "p50": self.quantile(0.5, **labels),
+            "p95": self.quantile(0.95, **labels),
+            "p99": self.quantile(0.99, **labels)
+        }
+
+    def label_sets(self) -> List[Dict[str, str]]:
+        return [dict(key) for key in self._counts]
+
+    def render(self, full_name: str) -> List[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{full_name}_bucket{_format_labels(key, {'le': str(bound)})} {cumulative}")
+            cumulative += counts[-1]
+            lines.append(f"{full_name}_bucket{_format_labels(key, {'le': '+Inf'})} {cumulative}")
+            lines.append(f"{full_name}_sum{_format_labels(key)} {self._sums[key]}")
+            lines.append(f"{full_name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Get-or-create registry of named metrics"""
+
+    def __init__(self, namespace: str = NAMESPACE):
+        self.namespace = namespace
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} already registered as {metric.kind}")
+        return metric
+
+    def counter(self, name: str, description: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, description, labelnames)
+
+    def gauge(self, name: str, description: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, description, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render_prometheus(self) -> str:
+        """Export all metrics in Prometheus text exposition format"""
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {metric.description}")
+            lines.append(f"# TYPE {full_name} {metric.kind}")
+            lines.extend(metric.render(full_name))
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+REGISTRY = MetricsRegistry()
+
+
+# Optional HTTP exporter
+_metrics_runner: Optional[web.AppRunner] = None
+
+
+async def _metrics_handler(request: web.Request) -> web.Response:
+    return web.Response(
+        text=REGISTRY.render_prometheus(),
+        content_type="text/plain",
+        charset="utf-8",
+        headers={"X-Prometheus-Format": "0.0.4"}
+    )
+
+
+async def init_metrics_server(port: Optional[int], host: str = "0.0.0.0") -> bool:
+    """
+    Serve REGISTRY on GET /metrics (Prometheus scrape target)
+
+    Args:
+        port: TCP port; None or 0 disables the exporter
+        host: Bind address
+
+    Returns:
+        True if started
+    """
+    global _metrics_runner
+    if not port or _metrics_runner is not None:
+        return False
+
+    app = web.Application()
+    app.router.add_get("/metrics", _metrics_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        await runner.cleanup()
+        logger.warning(f"⚠️ Metrics exporter not started on port {port}: {e}")
+        return False
+
+    _metrics_runner = runner
+    logger.info(f"📈 Metrics exporter on http://{host}:{port}/metrics")
+    return True
+
+
+async def close_metrics_server():
+    """Stop the HTTP exporter"""
+    global _metrics_runner
+    if _metrics_runner:
+        await _metrics_runner.cleanup()
+        _metrics_runner = None
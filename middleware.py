@@ -0,0 +1,141 @@
+"""
+Session middleware for DrAivBot
+Loads the session once per update and persists changed fields once
+
+Usage in handlers:
+    async def handler(callback: types.CallbackQuery, session: SessionContext):
+        session.state = "MENU"
+        session.data["lang"] = "en"
+        # Changes are saved with a single update_session() after the handler returns
+"""
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+
+logger = logging.getLogger(__name__)
+
+# Session columns that handlers may change
+_TRACKED_COLUMNS = ("state", "user_id", "company_id")
+
+
+class SessionContext:
+    """
+    Mutable session for the duration of one update
+
+    Features:
+    - Attribute access: state, user_id, company_id, data
+    - Dict-style reads (session.get("data")) for existing code
+    - Dirty tracking by comparison with the loaded snapshot,
+      so nested changes in data are detected as well
+    """
+
+    def __init__(self, telegram_id: int, session: Dict[str, Any]):
+        self.telegram_id = telegram_id
+        self.id = session.get("id")
+        self.expires_at = session.get("expires_at")
+        self.state: Optional[str] = session.get("state")
+        self.user_id: Optional[str] = session.get("user_id")
+        self.company_id: Optional[str] = session.get("company_id")
+        self.data: Dict[str, Any] = copy.deepcopy(session.get("data") or {})
+        self._mark_clean()
+
+    def _mark_clean(self):
+        """Remember current values as persisted"""
+        self._original_columns = {column: getattr(self, column) for column in _TRACKED_COLUMNS}
+        self._original_data = copy.deepcopy(self.data)
+
+    @property
+    def lang(self) -> str:
+        """User language (defaults to ru)"""
+        return self.data.get("lang", "ru")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read access"""
+        if key in _TRACKED_COLUMNS or key in ("id", "telegram_id", "data", "expires_at"):
+            value = getattr(self, key)
+            return default if value is None else value
+        return default
+
+    def is_dirty(self) -> bool:
+        """Check if anything changed since load (or last commit)"""
+        return bool(self.get_changes())
+
+    def get_changes(self) -> Dict[str, Any]:
+        """
+        Get changed fields as update_session() keyword arguments
+
+        Returns:
+            Dictionary with only the changed columns and data keys
+            (data_patch / data_unset), so untouched keys are not rewritten
+        """
+        changes = {
+            column: getattr(self, column)
+            for column in _TRACKED_COLUMNS
+            if getattr(self, column) != self._original_columns[column]
+        }
+
+        data_patch = {
+            key: value
+            for key, value in self.data.items()
+            if key not in self._original_data or self._original_data[key] != value
+        }
+        data_unset = [key for key in self._original_data if key not in self.data]
+        if data_patch:
+            changes["data_patch"] = data_patch
+        if data_unset:
+            changes["data_unset"] = data_unset
+        return changes
+
+    async def commit(self, manager) -> bool:
+        """
+        Persist changed fields with a single update_session() call
+
+        Returns:
+            True if anything was written
+        """
+        changes = self.get_changes()
+        if not changes:
+            return False
+
+        await manager.update_session(self.telegram_id, **changes)
+        self._mark_clean()
+        logger.debug(f"💾 Session committed for {self.telegram_id}: {', '.join(changes)}")
+        return True
+
+
+class SessionMiddleware(BaseMiddleware):
+    """
+    Inner middleware: one session load and at most one session write per update
+
+    Register on the dispatcher so module routers share it:
+        dp.message.middleware(SessionMiddleware(SessionManager))
+        dp.callback_query.middleware(SessionMiddleware(SessionManager))
+    """
+
+    def __init__(self, manager):
+        """
+        Args:
+            manager: Session manager class (SessionManager or SimpleSessionManager)
+        """
+        self.manager = manager
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user: Optional[User] = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        session = SessionContext(user.id, await self.manager.get_session(user.id))
+        data["session"] = session
+
+        # Commit only after the handler succeeded: a failed update leaves state untouched
+        result = await handler(event, data)
+        await session.commit(self.manager)
+        return result
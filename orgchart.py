@@ -40,24 +40,84 @@ DEPARTMENT_NAMES = {
 }
 
 
+def get_default_positions() -> list:
+    """Rows for the 21 standard positions (database column names)"""
+    return [
+        {
+            "position_number": pos_data["pos"],
+            "position_name": pos_data["name"],
+            "department_number": pos_data["dept"],
+            "division_number": pos_data["div"],
+            "is_founder": pos_data["pos"] == 21,  # Position 21 is founder
+            "is_ceo": False
+        }
+        for pos_data in ORGBOARD_21_POSITIONS
+    ]
+
+
 async def create_company_positions(company_id: str, founder_user_id: str):
     """
-    Create all 21 positions for a new company
+    Create all 21 positions for an existing company (one multi-row insert)
     Founder gets assigned to all positions initially
     """
-    from bot.core.database import create_position
-
-    for pos_data in ORGBOARD_21_POSITIONS:
-        await create_position(
-            company_id=company_id,
-            position_number=pos_data["pos"],
-            position_name=pos_data["name"],
-            department_number=pos_data["dept"],
-            division_number=pos_data["div"],
-            assigned_user_id=founder_user_id,
-            is_founder=(pos_data["pos"] == 21),  # Position 21 is founder
-            is_ceo=False
-        )
+    from bot.core.database import create_positions
+
+    return await create_positions(company_id, get_default_positions(), assigned_user_id=founder_user_id)
+
+
+async def register_company(
+    company_name: str,
+    telegram_id: int,
+    username: str = None,
+    full_name: str = None,
+    language: str = "ru"
+) -> dict:
+    """
+    Create company, founder user and all 21 positions atomically (one round-trip)
+
+    Returns:
+        {"company": {...}, "user": {...}, "positions_created": 21}
+    """
+    from bot.core.database import bootstrap_company
+
+    return await bootstrap_company(
+        company_name,
+        telegram_id,
+        get_default_positions(),
+        username=username,
+        full_name=full_name,
+        language=language
+    )
+
+
+async def get_orgchart_text(company_id: str, lang: str = "ru") -> str:
+    """
+    Rendered org chart (cached per company and language)
+
+    The rendered text lives in one Redis hash per company (field = language),
+    dropped together with the cached positions on any position write.
+    """
+    from bot.core.database import (
+        drop_if_invalidated, get_company_positions, get_positions_generation, orgchart_cache_key
+    )
+    from bot.core.redis_cache import get_redis_cache
+    from bot.config import ORGCHART_CACHE_TTL
+
+    cache = await get_redis_cache()
+    cache_key = orgchart_cache_key(company_id)
+    if cache and cache.is_connected(cache_key):
+        cached = await cache.hmget(cache_key, [lang])
+        if cached and cached[0] is not None:
+            return cached[0]
+
+    generation = await get_positions_generation(company_id)
+    text = format_orgchart(await get_company_positions(company_id), lang)
+
+    if cache and cache.is_connected(cache_key):
+        async with cache.pipeline() as batch:
+            batch.hset(cache_key, {lang: text}).expire(cache_key, ORGCHART_CACHE_TTL)
+        await drop_if_invalidated(company_id, generation, cache_key)
+    return text
 
 
 def format_orgchart(positions: list, lang: str = "ru") -> str:
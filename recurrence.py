@@ -0,0 +1,262 @@
+"""
+Recurring events for DrAivBot
+Lazy expansion of RFC 5545 recurrence rules (python-dateutil)
+
+A series is one `events` row: `event_date` is the first occurrence,
+`recurrence_rule` the RRULE (e.g. "FREQ=WEEKLY;BYDAY=MO,WE,FR"),
+`recurrence_timezone` the zone the wall-clock time is kept in (a 09:00
+stand-up stays at 09:00 across DST changes). Occurrences are generated on
+demand for the queried window only, so table size and query cost do not
+depend on how far a series runs.
+
+Exceptions are one jsonb map per series, keyed by the original occurrence
+start (UTC, ISO 8601):
+    {"2026-10-20T06:00:00+00:00": null}                        -- cancelled
+    {"2026-10-22T06:00:00+00:00": {"event_date": "...", "title": "..."}}  -- moved/changed
+
+Schema (events):
+    ALTER TABLE events
+        ADD COLUMN recurrence_rule text,
+        ADD COLUMN recurrence_timezone text,
+        ADD COLUMN recurrence_until timestamptz,   -- last occurrence start (NULL = endless)
+        ADD COLUMN recurrence_exceptions jsonb;
+    CREATE INDEX events_user_series_idx ON events (user_id, event_date)
+        WHERE recurrence_rule IS NOT NULL;
+"""
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from heapq import merge
+from itertools import takewhile
+from typing import Any, Dict, Iterator, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from dateutil.rrule import DAILY, HOURLY, MINUTELY, SECONDLY, WEEKLY, rrule, rrulestr
+
+# Fields an exception may override
+OVERRIDE_FIELDS = ("title", "description", "event_type", "event_date", "duration_minutes", "reminder_minutes")
+
+# Occurrences scanned for the next reminder before giving up (all cancelled,
+# reminders switched off per occurrence, ...)
+_MAX_REMINDER_SCAN = 1000
+
+# Fixed-length periods in wall-clock time: a rule started a whole number of
+# intervals later yields the same occurrences from there on
+_PERIODS = {
+    WEEKLY: timedelta(weeks=1),
+    DAILY: timedelta(days=1),
+    HOURLY: timedelta(hours=1),
+    MINUTELY: timedelta(minutes=1),
+    SECONDLY: timedelta(seconds=1)
+}
+
+_UTC_UNTIL = re.compile(r"UNTIL=(\d{8}T\d{6})Z", re.IGNORECASE)
+
+
+def _zone(name: Optional[str]):
+    try:
+        return ZoneInfo(name) if name else timezone.utc
+    except (KeyError, ValueError):
+        return timezone.utc
+
+
+@lru_cache(maxsize=1024)
+def _get_rule(rule: str, dtstart: datetime, tz_name: Optional[str]):
+    """
+    Parsed rule over naive wall-clock times in the series timezone
+
+    Occurrences are generated as local wall-clock times and localized
+    afterwards, so an RFC 5545 UTC "UNTIL=...Z" is converted to local time.
+    """
+    tz = _zone(tz_name)
+
+    def to_local(match):
+        until = datetime.strptime(match.group(1), "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return f"UNTIL={until.astimezone(tz):%Y%m%dT%H%M%S}"
+
+    local_start = dtstart.astimezone(tz).replace(tzinfo=None)
+    return rrulestr(_UTC_UNTIL.sub(to_local, rule.strip()), dtstart=local_start)
+
+
+def _anchored(parsed, local_start: datetime):
+    """
+    Rule restarted at the last whole interval before local_start
+
+    Expansion then begins next to the queried time instead of walking every
+    occurrence since the series began, so its cost does not grow with the
+    series' age. COUNT rules (numbered from the first occurrence) and
+    monthly/yearly rules (at most 12 periods a year) start at dtstart.
+    """
+    # rrule keeps its parameters in private attributes only
+    period = _PERIODS.get(parsed._freq) if isinstance(parsed, rrule) else None
+    if period is None or parsed._count is not None or local_start <= parsed._dtstart:
+        return parsed
+    step = period * parsed._interval
+    return parsed.replace(dtstart=parsed._dtstart + step * ((local_start - parsed._dtstart) // step))
+
+
+def _localize(value: datetime, tz) -> datetime:
+    return value.replace(tzinfo=tz).astimezone(timezone.utc)
+
+
+def exception_key(occurrence_start: datetime) -> str:
+    """Exceptions map key of an occurrence (its original start)"""
+    return occurrence_start.astimezone(timezone.utc).isoformat()
+
+
+def parse_exceptions(raw: Any) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Exceptions map from a jsonb column (asyncpg returns text)"""
+    if not raw:
+        return {}
+    return json.loads(raw) if isinstance(raw, str) else dict(raw)
+
+
+def series_end(
+    rule: str,
+    dtstart: datetime,
+    tz_name: Optional[str] = None,
+    exceptions: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+) -> Optional[datetime]:
+    """
+    Start of the last occurrence (stored as recurrence_until)
+
+    Raises:
+        ValueError: Invalid rule
+
+    Returns:
+        None for endless series (no COUNT/UNTIL)
+    """
+    parsed = _get_rule(rule, dtstart, tz_name)
+    if not re.search(r"\b(COUNT|UNTIL)=", rule, re.IGNORECASE):
+        return None
+
+    last = None
+    if isinstance(parsed, rrule) and parsed._until is not None and parsed._count is None:
+        last = _anchored(parsed, parsed._until).before(parsed._until, inc=True)
+    else:
+        for last in parsed:
+            pass
+    end = _localize(last, _zone(tz_name)) if last else dtstart
+
+    # A moved occurrence can end the series later
+    for override in (exceptions or {}).values():
+        if override and override.get("event_date"):
+            end = max(end, datetime.fromisoformat(override["event_date"]))
+    return end
+
+
+def is_occurrence(event: Dict[str, Any], start: datetime) -> bool:
+    """Whether the series' rule generates an occurrence starting at `start` (exceptions ignored)"""
+    tz = _zone(event.get("recurrence_timezone"))
+    local_start = start.astimezone(tz).replace(tzinfo=None)
+    rule = _anchored(
+        _get_rule(event["recurrence_rule"], event["event_date"], event.get("recurrence_timezone")),
+        local_start
+    )
+    first = next(iter(rule.xafter(local_start, count=1, inc=True)), None)
+    return first is not None and _localize(first, tz) == start
+
+
+def _occurrence(event: Dict[str, Any], original: datetime, override: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    occurrence = {key: value for key, value in event.items() if key != "recurrence_exceptions"}
+    occurrence["event_date"] = original
+    occurrence["occurrence_start"] = original
+    if override:
+        occurrence.update({key: override[key] for key in OVERRIDE_FIELDS if key in override})
+        if "event_date" in override:
+            occurrence["event_date"] = datetime.fromisoformat(override["event_date"])
+    return occurrence
+
+
+def iter_occurrences(event: Dict[str, Any], start: datetime) -> Iterator[Dict[str, Any]]:
+    """
+    Occurrences starting at or after `start`, in start order (lazy, may be endless)
+
+    Args:
+        event: Series (event dict with recurrence_* fields)
+        start: Earliest occurrence start
+
+    Yields:
+        Event dicts: event_date is the occurrence start (after overrides),
+        occurrence_start the original start (exceptions key)
+    """
+    tz = _zone(event.get("recurrence_timezone"))
+    local_start = start.astimezone(tz).replace(tzinfo=None)
+    rule = _anchored(
+        _get_rule(event["recurrence_rule"], event["event_date"], event.get("recurrence_timezone")),
+        local_start
+    )
+    exceptions = parse_exceptions(event.get("recurrence_exceptions"))
+
+    def generated():
+        for local in rule.xafter(local_start, inc=True):
+            original = _localize(local, tz)
+            key = exception_key(original)
+            if key not in exceptions:
+                yield _occurrence(event, original, None)
+                continue
+            override = exceptions[key]
+            # Cancelled, or moved (yielded from `moved` at its new time)
+            if override is None or "event_date" in override:
+                continue
+            yield _occurrence(event, original, override)
+
+    moved = sorted(
+        (
+            _occurrence(event, datetime.fromisoformat(key), override)
+            for key, override in exceptions.items()
+            if override and "event_date" in override
+        ),
+        key=lambda occurrence: occurrence["event_date"]
+    )
+    moved = [occurrence for occurrence in moved if occurrence["event_date"] >= start]
+
+    if not moved:
+        return generated()
+    return merge(generated(), moved, key=lambda occurrence: occurrence["event_date"])
+
+
+def expand_occurrences(event: Dict[str, Any], start: datetime, end: datetime) -> Iterator[Dict[str, Any]]:
+    """Occurrences starting in [start, end), in start order (lazy)"""
+    return takewhile(lambda occurrence: occurrence["event_date"] < end, iter_occurrences(event, start))
+
+
+def _reminder_time(occurrence: Dict[str, Any]) -> Optional[datetime]:
+    minutes = occurrence.get("reminder_minutes")
+    if minutes is None:
+        return None
+    return occurrence["event_date"] - timedelta(minutes=minutes)
+
+
+def next_reminder(event: Dict[str, Any], after: datetime) -> Optional[Tuple[datetime, Dict[str, Any]]]:
+    """
+    Reminder of the first occurrence starting after `after`
+
+    Returns:
+        (reminder_at, occurrence), None if no occurrence has a reminder
+    """
+    for scanned, occurrence in enumerate(iter_occurrences(event, after)):
+        if scanned >= _MAX_REMINDER_SCAN:
+            break
+        reminder_at = _reminder_time(occurrence)
+        if occurrence["event_date"] > after and reminder_at is not None:
+            return reminder_at, occurrence
+    return None
+
+
+def occurrence_starting_at(event: Dict[str, Any], start: datetime) -> Optional[Dict[str, Any]]:
+    """Occurrence whose (overridden) start is `start` (None if the series changed)"""
+    for occurrence in iter_occurrences(event, start):
+        return occurrence if occurrence["event_date"] == start else None
+    return None
+
+
+def occurrence_for_reminder(event: Dict[str, Any], reminder_at: datetime) -> Optional[Dict[str, Any]]:
+    """Occurrence a stored reminder_at belongs to (None if the series changed)"""
+    for scanned, occurrence in enumerate(iter_occurrences(event, reminder_at)):
+        if scanned >= _MAX_REMINDER_SCAN:
+            break
+        if _reminder_time(occurrence) == reminder_at:
+            return occurrence
+    return None
@@ -2,14 +2,226 @@
 Redis Cache Manager for DrAivBot
 High-performance session caching with automatic fallback to Supabase
 """
-import json
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Iterable, List, AsyncIterator, Callable, Union
+from urllib.parse import urlsplit
 from redis import asyncio as aioredis
-from redis.exceptions import RedisError
+from redis.exceptions import RedisError, ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from bot.core.redis_codec import Codec, get_codec
+from bot.core.metrics import REGISTRY
+from bot.core.hash_ring import HashRing
+from bot.config import (
+    REDIS_CODEC,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_FAILURE_THRESHOLD,
+    REDIS_RECONNECT_MAX_BACKOFF,
+    REDIS_VIRTUAL_NODES
+)
 
 logger = logging.getLogger(__name__)
 
+# Client-side metrics per key namespace ("session:123" → "session")
+_requests = REGISTRY.counter(
+    "redis_cache_requests_total", "Cache calls by namespace, operation and result",
+    ["namespace", "op", "result"]
+)
+_latency = REGISTRY.histogram(
+    "redis_cache_latency_seconds", "Cache call latency incl. (de)serialization",
+    ["namespace", "op"]
+)
+_codec_time = REGISTRY.histogram(
+    "redis_cache_codec_seconds", "Value (de)serialization time",
+    ["namespace", "direction"],
+    buckets=(0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.01)
+)
+
+# Ops whose hit/miss results make up the read hit ratio
+_READ_OPS = ("get", "get_many", "hgetall", "hmget")
+
+
+def _namespace(key: str) -> str:
+    """Metrics namespace of a key: the part before the first ':'"""
+    namespace, sep, _ = key.partition(":")
+    return namespace if sep else "other"
+
+
+# Partial hash update that never creates a hash from scratch:
+# ARGV = [ttl, n_delete, delete_field..., field, value, field, value, ...]
+_HASH_UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+local n_delete = tonumber(ARGV[2])
+for i = 3, 2 + n_delete do
+    redis.call('HDEL', KEYS[1], ARGV[i])
+end
+if #ARGV > 2 + n_delete then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 3 + n_delete))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Lock release/extend only by the holder (compare token first)
+_LOCK_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_LOCK_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class CircuitBreaker:
+    """
+    Redis health state machine
+
+    - closed: requests go to Redis
+    - open: Redis considered down, requests fail fast (fallback to Supabase)
+    - half_open: a background probe is checking Redis, requests still fail fast
+
+    Opens after `failure_threshold` transport errors within `failure_window` seconds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, failure_window: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.state = self.CLOSED
+        self.opened_at: Optional[float] = None
+        self._failures: List[float] = []
+
+    def allows_requests(self) -> bool:
+        return self.state == self.CLOSED
+
+    def record_failure(self) -> bool:
+        """
+        Register a transport error
+
+        Returns:
+            True if this failure opened the circuit
+        """
+        if self.state != self.CLOSED:
+            return False
+
+        now = time.monotonic()
+        self._failures = [t for t in self._failures if now - t < self.failure_window]
+        self._failures.append(now)
+        if len(self._failures) >= self.failure_threshold:
+            self.open()
+            return True
+        return False
+
+    def open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._failures.clear()
+
+    def half_open(self):
+        self.state = self.HALF_OPEN
+
+    def close(self):
+        self.state = self.CLOSED
+        self.opened_at = None
+        self._failures.clear()
+
+
+class CacheBatch:
+    """
+    Commands queued for one round-trip (see RedisCache.pipeline)
+
+    Each queued command appends one entry to `results` after execution.
+    On error or without a connection every result is None (graceful fallback).
+    """
+
+    def __init__(self, cache: "RedisCache", transaction: bool = False):
+        self._cache = cache
+        self._pipe = cache.redis.pipeline(transaction=transaction) if cache.is_connected() else None
+        self._decoders: List[Callable[[Any], Any]] = []
+        self.results: List[Any] = []
+        self.ok = False
+
+    def _queue(self, decoder: Callable[[Any], Any], command: Callable[[Any], Any]) -> "CacheBatch":
+        if self._pipe is not None:
+            command(self._pipe)
+        self._decoders.append(decoder)
+        return self
+
+    def _decode_value(self, value):
+        return self._cache.codec.decode(value) if value else None
+
+    def _decode_hash(self, mapping):
+        if not mapping:
+            return None
+        return {field.decode("utf-8"): self._cache.codec.decode(value) for field, value in mapping.items()}
+
+    def get(self, key: str) -> "CacheBatch":
+        return self._queue(self._decode_value, lambda pipe: pipe.get(key))
+
+    def set(self, key: str, value: Any, ttl: int = 86400) -> "CacheBatch":
+        encoded = self._cache.codec.encode(value)
+        return self._queue(bool, lambda pipe: pipe.setex(key, ttl, encoded))
+
+    def delete(self, *keys: str) -> "CacheBatch":
+        return self._queue(int, lambda pipe: pipe.delete(*keys))
+
+    def exists(self, key: str) -> "CacheBatch":
+        return self._queue(lambda value: value > 0, lambda pipe: pipe.exists(key))
+
+    def expire(self, key: str, ttl: int) -> "CacheBatch":
+        return self._queue(bool, lambda pipe: pipe.expire(key, ttl))
+
+    def hgetall(self, key: str) -> "CacheBatch":
+        return self._queue(self._decode_hash, lambda pipe: pipe.hgetall(key))
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> "CacheBatch":
+        encoded = {field: self._cache.codec.encode(value) for field, value in mapping.items()}
+        return self._queue(int, lambda pipe: pipe.hset(key, mapping=encoded))
+
+    async def execute(self) -> List[Any]:
+        """
+        Send all queued commands in one round-trip
+
+        Returns:
+            Decoded results in command order (None for failed commands)
+        """
+        self.results = [None] * len(self._decoders)
+        if self._pipe is None or not self._decoders:
+            return self.results
+
+        try:
+            raw_results = await self._pipe.execute(raise_on_error=False)
+        except RedisError as e:
+            self._cache._record_error(e)
+            logger.warning(f"Redis pipeline error: {e}")
+            return self.results
+
+        for i, (decoder, raw) in enumerate(zip(self._decoders, raw_results)):
+            if isinstance(raw, Exception):
+                logger.warning(f"Redis pipeline command error: {raw}")
+                continue
+            try:
+                self.results[i] = decoder(raw)
+            except ValueError as e:
+                logger.warning(f"Redis value decode error: {e}")
+        self.ok = True
+        return self.results
+
 
 class RedisCache:
     """
@@ -20,58 +232,163 @@ class RedisCache:
     - Automatic TTL (24 hours)
     - Graceful fallback to Supabase
     - Connection pooling
+    - Circuit breaker: fail fast while Redis is down
+    - Background reconnection with exponential backoff (no restart needed)
     """
 
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, codec: Optional[Codec] = None):
         """
         Initialize Redis connection
 
         Args:
             redis_url: Redis connection URL (redis://host:port/db)
+            codec: Value codec (default: get_codec() → msgpack, reads all formats)
         """
         self.redis_url = redis_url
+        self.codec = codec or get_codec()
         self.redis: Optional[aioredis.Redis] = None
-        self._connected = False
+        self._breaker = CircuitBreaker(failure_threshold=REDIS_FAILURE_THRESHOLD)
+        self._breaker.open()  # closed by the first successful connect()
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._subscriptions: List[asyncio.Task] = []
+        self.reconnects = 0  # bumped whenever the circuit closes again
 
     async def connect(self) -> bool:
         """
         Connect to Redis server
 
+        On failure the cache stays usable (fail-fast fallback) and keeps
+        reconnecting in the background.
+
         Returns:
             True if connected, False otherwise
         """
+        if await self._probe():
+            logger.info("✅ Redis connected successfully")
+            return True
+
+        self._start_recovery()
+        return False
+
+    async def _probe(self) -> bool:
+        """Create the client if needed and PING; close the circuit on success"""
         try:
-            self.redis = await aioredis.from_url(
-                self.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=50,
-                socket_connect_timeout=5,
-                socket_keepalive=True,
-                health_check_interval=30
-            )
+            if self.redis is None:
+                self.redis = await aioredis.from_url(
+                    self.redis_url,
+                    encoding="utf-8",
+                    decode_responses=False,  # values are codec bytes
+                    max_connections=50,
+                    socket_connect_timeout=5,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    socket_keepalive=True,
+                    health_check_interval=30
+                )
 
             # Test connection
             await self.redis.ping()
-            self._connected = True
-            logger.info("✅ Redis connected successfully")
+            if self._breaker.state != CircuitBreaker.CLOSED:
+                self.reconnects += 1
+            self._breaker.close()
             return True
 
         except Exception as e:
             logger.warning(f"⚠️ Redis connection failed: {e}. Using Supabase only.")
-            self._connected = False
+            self._breaker.open()
             return False
 
+    def _record_error(self, error: Exception):
+        """Count transport errors; open the circuit and start recovery when unhealthy"""
+        if not isinstance(error, (RedisConnectionError, RedisTimeoutError)):
+            return  # command errors (WRONGTYPE, ...) say nothing about health
+        if self._breaker.record_failure():
+            logger.warning("⚠️ Redis circuit opened: failing fast, reconnecting in background")
+            self._start_recovery()
+
+    def _start_recovery(self):
+        """Start the background reconnect loop (once)"""
+        if self._recovery_task is None or self._recovery_task.done():
+            try:
+                self._recovery_task = asyncio.get_running_loop().create_task(self._recover())
+            except RuntimeError:
+                pass  # no running loop (e.g. during interpreter shutdown)
+
+    async def _recover(self, base_delay: float = 1.0):
+        """Half-open probing with exponential backoff and jitter until Redis answers"""
+        delay = base_delay
+        while True:
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            self._breaker.half_open()
+            if await self._probe():
+                logger.info("✅ Redis recovered, circuit closed")
+                return
+            delay = min(delay * 2, REDIS_RECONNECT_MAX_BACKOFF)
+
     async def disconnect(self):
         """Disconnect from Redis"""
+        if self._recovery_task:
+            self._recovery_task.cancel()
+            self._recovery_task = None
+        for task in self._subscriptions:
+            task.cancel()
+        if self._subscriptions:
+            await asyncio.gather(*self._subscriptions, return_exceptions=True)
+            self._subscriptions.clear()
         if self.redis:
             await self.redis.close()
-            self._connected = False
+            self.redis = None
+            self._breaker.open()
             logger.info("Redis disconnected")
 
-    def is_connected(self) -> bool:
-        """Check if Redis is connected"""
-        return self._connected
+    def is_connected(self, key: Optional[str] = None) -> bool:
+        """
+        Check if Redis is usable right now (circuit closed)
+
+        Args:
+            key: Key about to be used (only matters for ShardedRedisCache)
+        """
+        return self.redis is not None and self._breaker.allows_requests()
+
+    def get_health(self) -> Dict[str, Any]:
+        """Circuit breaker state for monitoring"""
+        return {
+            "state": self._breaker.state,
+            "open_for_seconds": (
+                time.monotonic() - self._breaker.opened_at if self._breaker.opened_at else 0
+            ),
+            "recovering": bool(self._recovery_task and not self._recovery_task.done())
+        }
+
+    def _encode(self, namespace: str, value: Any) -> bytes:
+        started = time.perf_counter()
+        data = self.codec.encode(value)
+        _codec_time.observe(time.perf_counter() - started, namespace=namespace, direction="encode")
+        return data
+
+    def _decode(self, namespace: str, data: bytes) -> Any:
+        started = time.perf_counter()
+        value = self.codec.decode(data)
+        _codec_time.observe(time.perf_counter() - started, namespace=namespace, direction="decode")
+        return value
+
+    def _encode_mapping(self, namespace: str, mapping: Dict[str, Any]) -> Dict[str, bytes]:
+        started = time.perf_counter()
+        encoded = {field: self.codec.encode(value) for field, value in mapping.items()}
+        _codec_time.observe(time.perf_counter() - started, namespace=namespace, direction="encode")
+        return encoded
+
+    def _decode_mapping(self, namespace: str, mapping: Dict[bytes, bytes]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        decoded = {field.decode("utf-8"): self.codec.decode(value) for field, value in mapping.items()}
+        _codec_time.observe(time.perf_counter() - started, namespace=namespace, direction="decode")
+        return decoded
+
+    @staticmethod
+    def _observe(namespace: str, op: str, started: float, result: str, count: int = 1):
+        """Record one call: latency plus `count` results (hit/miss/ok/error)"""
+        _latency.observe(time.perf_counter() - started, namespace=namespace, op=op)
+        if count:
+            _requests.inc(count, namespace=namespace, op=op, result=result)
 
     async def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -83,18 +400,29 @@ class RedisCache:
         Returns:
             Cached data or None
         """
-        if not self._connected:
+        if not self.is_connected():
             return None
 
+        namespace = _namespace(key)
+        started = time.perf_counter()
         try:
             value = await self.redis.get(key)
             if value:
-                return json.loads(value)
+                value = self._decode(namespace, value)
+                self._observe(namespace, "get", started, "hit")
+                return value
+            self._observe(namespace, "get", started, "miss")
             return None
 
         except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "get", started, "error")
             logger.warning(f"Redis GET error: {e}")
             return None
+        except ValueError as e:
+            self._observe(namespace, "get", started, "error")
+            logger.warning(f"Redis value decode error ({key}): {e}")
+            return None
 
     async def set(
         self,
@@ -113,15 +441,20 @@ class RedisCache:
         Returns:
             True if successful, False otherwise
         """
-        if not self._connected:
+        if not self.is_connected():
             return False
 
+        namespace = _namespace(key)
+        started = time.perf_counter()
         try:
-            serialized = json.dumps(value, default=str)
+            serialized = self._encode(namespace, value)
             await self.redis.setex(key, ttl, serialized)
+            self._observe(namespace, "set", started, "ok")
             return True
 
         except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "set", started, "error")
             logger.warning(f"Redis SET error: {e}")
             return False
 
@@ -135,14 +468,19 @@ class RedisCache:
         Returns:
             True if successful, False otherwise
         """
-        if not self._connected:
+        if not self.is_connected():
             return False
 
+        namespace = _namespace(key)
+        started = time.perf_counter()
         try:
             await self.redis.delete(key)
+            self._observe(namespace, "delete", started, "ok")
             return True
 
         except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "delete", started, "error")
             logger.warning(f"Redis DELETE error: {e}")
             return False
 
@@ -156,13 +494,14 @@ class RedisCache:
         Returns:
             True if exists, False otherwise
         """
-        if not self._connected:
+        if not self.is_connected():
             return False
 
         try:
             return await self.redis.exists(key) > 0
 
         except RedisError as e:
+            self._record_error(e)
             logger.warning(f"Redis EXISTS error: {e}")
             return False
 
@@ -177,7 +516,7 @@ class RedisCache:
         Returns:
             True if successful, False otherwise
         """
-        if not self._connected:
+        if not self.is_connected():
             return False
 
         try:
@@ -185,28 +524,544 @@ class RedisCache:
             return True
 
         except RedisError as e:
+            self._record_error(e)
             logger.warning(f"Redis EXPIRE error: {e}")
             return False
 
-    async def keys(self, pattern: str = "*") -> list:
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
         """
-        Get all keys matching pattern
+        Get many values in one round-trip (MGET)
 
         Args:
-            pattern: Key pattern (default: all keys)
+            keys: Cache keys
 
         Returns:
-            List of matching keys
+            Found keys → values (missing keys and errors are omitted)
+        """
+        keys = list(keys)
+        if not self.is_connected() or not keys:
+            return {}
+
+        namespace = _namespace(keys[0])
+        started = time.perf_counter()
+        try:
+            values = await self.redis.mget(keys)
+
+        except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "get_many", started, "error", len(keys))
+            logger.warning(f"Redis MGET error: {e}")
+            return {}
+
+        found = {}
+        errors = 0
+        for key, value in zip(keys, values):
+            if not value:
+                continue
+            try:
+                found[key] = self._decode(namespace, value)
+            except ValueError as e:
+                errors += 1
+                logger.warning(f"Redis value decode error ({key}): {e}")
+
+        self._observe(namespace, "get_many", started, "hit", len(found))
+        _requests.inc(len(keys) - len(found) - errors, namespace=namespace, op="get_many", result="miss")
+        if errors:
+            _requests.inc(errors, namespace=namespace, op="get_many", result="error")
+        return found
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: int = 86400) -> bool:
+        """
+        Set many values with the same TTL in one round-trip
+
+        Args:
+            mapping: Cache keys → values
+            ttl: Time to live in seconds (default 24h)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_connected():
+            return False
+        if not mapping:
+            return True
+
+        namespace = _namespace(next(iter(mapping)))
+        started = time.perf_counter()
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.setex(key, ttl, self._encode(namespace, value))
+                await pipe.execute()
+            self._observe(namespace, "set_many", started, "ok", len(mapping))
+            return True
+
+        except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "set_many", started, "error", len(mapping))
+            logger.warning(f"Redis SET (batch) error: {e}")
+            return False
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete many keys in one round-trip
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of deleted keys (0 on error)
+        """
+        keys = list(keys)
+        if not self.is_connected() or not keys:
+            return 0
+
+        try:
+            return await self.redis.delete(*keys)
+
+        except RedisError as e:
+            self._record_error(e)
+            logger.warning(f"Redis DELETE (batch) error: {e}")
+            return 0
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[CacheBatch]:
+        """
+        Batch arbitrary commands into one round-trip
+
+        Usage:
+            async with cache.pipeline() as batch:
+                batch.get("session:1").hgetall("session:2").expire("session:3", 60)
+            first, second, third = batch.results
+
+        Args:
+            transaction: Wrap the batch in MULTI/EXEC (atomic)
+
+        Yields:
+            CacheBatch; commands run when the block exits without error
+        """
+        batch = CacheBatch(self, transaction=transaction)
+        try:
+            yield batch
+            await batch.execute()
+        finally:
+            if batch._pipe is not None:
+                await batch._pipe.reset()
+
+    async def hgetall(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get all fields of a hash
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Decoded field values or None (missing key or error)
+        """
+        if not self.is_connected():
+            return None
+
+        namespace = _namespace(key)
+        started = time.perf_counter()
+        try:
+            mapping = await self.redis.hgetall(key)
+            if mapping:
+                mapping = self._decode_mapping(namespace, mapping)
+                self._observe(namespace, "hgetall", started, "hit")
+                return mapping
+            self._observe(namespace, "hgetall", started, "miss")
+            return None
+
+        except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "hgetall", started, "error")
+            logger.warning(f"Redis HGETALL error: {e}")
+            return None
+        except ValueError as e:
+            self._observe(namespace, "hgetall", started, "error")
+            logger.warning(f"Redis value decode error ({key}): {e}")
+            return None
+
+    async def hmget(self, key: str, fields: List[str]) -> Optional[List[Any]]:
+        """
+        Get several fields of a hash in one call
+
+        Args:
+            key: Cache key
+            fields: Field names
+
+        Returns:
+            Decoded values (None for missing fields) or None on error
         """
-        if not self._connected:
-            return []
+        if not self.is_connected():
+            return None
 
+        namespace = _namespace(key)
+        started = time.perf_counter()
         try:
-            return await self.redis.keys(pattern)
+            values = await self.redis.hmget(key, fields)
+            values = [self._decode(namespace, value) if value is not None else None for value in values]
+            # Hit = the hash exists (some field present)
+            self._observe(
+                namespace, "hmget", started,
+                "hit" if any(value is not None for value in values) else "miss"
+            )
+            return values
 
         except RedisError as e:
-            logger.warning(f"Redis KEYS error: {e}")
-            return []
+            self._record_error(e)
+            self._observe(namespace, "hmget", started, "error")
+            logger.warning(f"Redis HMGET error: {e}")
+            return None
+        except ValueError as e:
+            self._observe(namespace, "hmget", started, "error")
+            logger.warning(f"Redis value decode error ({key}): {e}")
+            return None
+
+    async def replace_hash(
+        self,
+        key: str,
+        mapping: Dict[str, Any],
+        ttl: int = 86400
+    ) -> bool:
+        """
+        Atomically replace a hash (DEL + HSET + EXPIRE in one transaction)
+
+        Args:
+            key: Cache key
+            mapping: Field values to store
+            ttl: Time to live in seconds (default 24h)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.is_connected():
+            return False
+
+        namespace = _namespace(key)
+        started = time.perf_counter()
+        try:
+            encoded = self._encode_mapping(namespace, mapping)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping=encoded)
+                pipe.expire(key, ttl)
+                await pipe.execute()
+            self._observe(namespace, "replace_hash", started, "ok")
+            return True
+
+        except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "replace_hash", started, "error")
+            logger.warning(f"Redis HSET error: {e}")
+            return False
+
+    async def update_hash(
+        self,
+        key: str,
+        mapping: Dict[str, Any],
+        ttl: int = 86400,
+        delete_fields: Iterable[str] = ()
+    ) -> bool:
+        """
+        Set and delete individual hash fields, only if the hash exists
+
+        A missing hash is left missing, so a partial write can never
+        look like a complete cached value.
+
+        Args:
+            key: Cache key
+            mapping: Field values to set
+            ttl: New TTL in seconds
+            delete_fields: Field names to remove
+
+        Returns:
+            True if the hash existed and was updated, False otherwise
+        """
+        if not self.is_connected():
+            return False
+
+        namespace = _namespace(key)
+        started = time.perf_counter()
+        delete_fields = list(delete_fields)
+        args = [ttl, len(delete_fields), *delete_fields]
+        for field, value in self._encode_mapping(namespace, mapping).items():
+            args.extend((field, value))
+
+        try:
+            updated = await self.redis.eval(_HASH_UPDATE_SCRIPT, 1, key, *args)
+            # Absent = hash not cached, nothing updated (a write, not a read miss)
+            self._observe(namespace, "update_hash", started, "ok" if updated else "absent")
+            return bool(updated)
+
+        except RedisError as e:
+            self._record_error(e)
+            self._observe(namespace, "update_hash", started, "error")
+            logger.warning(f"Redis hash update error: {e}")
+            return False
+
+    async def acquire_lock(self, name: str, ttl: int) -> Optional[str]:
+        """
+        Try to acquire a lock (SET NX EX) without waiting
+
+        Args:
+            name: Lock key
+            ttl: Lock lifetime in seconds (released automatically if the holder dies)
+
+        Returns:
+            Token for release/extend, or None if held by someone else
+        """
+        if not self.is_connected():
+            return None
+
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(name, token, nx=True, ex=ttl)
+            return token if acquired else None
+
+        except RedisError as e:
+            self._record_error(e)
+            logger.warning(f"Redis lock acquire error: {e}")
+            return None
+
+    async def extend_lock(self, name: str, token: str, ttl: int) -> bool:
+        """
+        Extend a held lock
+
+        Returns:
+            True if still held and extended, False otherwise
+        """
+        if not self.is_connected():
+            return False
+
+        try:
+            return bool(await self.redis.eval(_LOCK_EXTEND_SCRIPT, 1, name, token, ttl))
+
+        except RedisError as e:
+            self._record_error(e)
+            logger.warning(f"Redis lock extend error: {e}")
+            return False
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        """
+        Release a held lock (no-op if it expired and was taken over)
+
+        Returns:
+            True if released, False otherwise
+        """
+        if not self.is_connected():
+            return False
+
+        try:
+            return bool(await self.redis.eval(_LOCK_RELEASE_SCRIPT, 1, name, token))
+
+        except RedisError as e:
+            self._record_error(e)
+            logger.warning(f"Redis lock release error: {e}")
+            return False
+
+    async def publish(self, channel: str, message: Any) -> int:
+        """
+        Publish a message (encoded with the cache codec)
+
+        Returns:
+            Number of subscribers that received it (0 on error)
+        """
+        if not self.is_connected():
+            return 0
+
+        try:
+            return await self.redis.publish(channel, self.codec.encode(message))
+
+        except RedisError as e:
+            self._record_error(e)
+            logger.warning(f"Redis PUBLISH error for channel {channel}: {e}")
+            return 0
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: Callable[[Any], None],
+        on_state: Optional[Callable[[bool], None]] = None
+    ) -> asyncio.Task:
+        """
+        Listen on a channel in the background (resubscribes after Redis outages)
+
+        Args:
+            channel: Channel name
+            handler: Called with each decoded message
+            on_state: Called with True once subscribed and with False when the
+                subscription is lost (messages may be missed until the next True)
+
+        Returns:
+            Listener task (cancelled by disconnect())
+        """
+        task = asyncio.get_running_loop().create_task(self._listen(channel, handler, on_state))
+        self._subscriptions.append(task)
+        return task
+
+    async def _listen(
+        self,
+        channel: str,
+        handler: Callable[[Any], None],
+        on_state: Optional[Callable[[bool], None]]
+    ):
+        delay = 1.0
+        while True:
+            if not self.is_connected():
+                await asyncio.sleep(delay)
+                continue
+
+            pubsub = self.redis.pubsub()
+            subscribed = False
+            reconnects = self.reconnects
+            try:
+                await pubsub.subscribe(channel)
+                subscribed = True
+                delay = 1.0
+                if on_state:
+                    on_state(True)
+                logger.info(f"📡 Subscribed to Redis channel {channel}")
+
+                # Leave when the circuit opens (or reopened and closed again
+                # in between): messages published meanwhile were lost
+                while self.is_connected() and self.reconnects == reconnects:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    try:
+                        handler(self.codec.decode(message["data"]))
+                    except ValueError as e:
+                        logger.warning(f"Redis message decode error on {channel}: {e}")
+
+            except RedisError as e:
+                self._record_error(e)
+                logger.warning(f"Redis subscription error on {channel}: {e}")
+                delay = min(delay * 2, REDIS_RECONNECT_MAX_BACKOFF)
+
+            finally:
+                if subscribed and on_state:
+                    on_state(False)
+                try:
+                    await pubsub.aclose()
+                except RedisError:
+                    pass
+
+            await asyncio.sleep(delay)
+
+    async def scan_batches(
+        self,
+        pattern: str = "*",
+        count: int = 500,
+        key_type: Optional[str] = None
+    ) -> AsyncIterator[List[str]]:
+        """
+        Stream matching keys page by page (cursor-based SCAN, non-blocking)
+
+        Args:
+            pattern: Key pattern (default: all keys)
+            count: COUNT hint, keys examined per SCAN call
+            key_type: Only keys of this Redis type ("string", "hash", ...)
+
+        Yields:
+            Lists of keys, one per non-empty SCAN page
+        """
+        if not self.is_connected():
+            return
+
+        cursor = 0
+        try:
+            while True:
+                cursor, keys = await self.redis.scan(
+                    cursor=cursor, match=pattern, count=count, _type=key_type
+                )
+                if keys:
+                    yield [key.decode("utf-8") for key in keys]
+                if cursor == 0:
+                    break
+
+        except RedisError as e:
+            self._record_error(e)
+            logger.warning(f"Redis SCAN error: {e}")
+
+    async def scan_iter(
+        self,
+        pattern: str = "*",
+        count: int = 500,
+        key_type: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream matching keys one by one in constant memory
+
+        Usage:
+            async for key in cache.scan_iter("session:*", key_type="hash"):
+                ...
+
+        Note: SCAN may return a key more than once if the keyspace is resized
+        during iteration.
+        """
+        async for keys in self.scan_batches(pattern, count=count, key_type=key_type):
+            for key in keys:
+                yield key
+
+    async def count_keys(self, pattern: str = "*", key_type: Optional[str] = None) -> int:
+        """
+        Count keys matching pattern (e.g. a namespace like "session:*")
+
+        Returns:
+            Number of matching keys (approximate if the keyspace changes meanwhile)
+        """
+        total = 0
+        async for keys in self.scan_batches(pattern, key_type=key_type):
+            total += len(keys)
+        return total
+
+    async def expire_keys(self, pattern: str, ttl: int, key_type: Optional[str] = None) -> int:
+        """
+        Set TTL on all keys matching pattern (one pipeline per SCAN page)
+
+        Returns:
+            Number of keys updated
+        """
+        updated = 0
+        async for keys in self.scan_batches(pattern, key_type=key_type):
+            async with self.pipeline() as batch:
+                for key in keys:
+                    batch.expire(key, ttl)
+            updated += sum(1 for result in batch.results if result)
+        return updated
+
+    async def delete_keys(self, pattern: str, key_type: Optional[str] = None) -> int:
+        """
+        Delete all keys matching pattern (UNLINK per SCAN page, freed in background)
+
+        Returns:
+            Number of deleted keys
+        """
+        deleted = 0
+        async for keys in self.scan_batches(pattern, key_type=key_type):
+            try:
+                deleted += await self.redis.unlink(*keys)
+            except RedisError as e:
+                self._record_error(e)
+                logger.warning(f"Redis UNLINK error: {e}")
+                break
+        return deleted
+
+    async def keys(self, pattern: str = "*") -> list:
+        """
+        Get all keys matching pattern
+
+        Built on SCAN (never blocks Redis), but still collects every key into
+        one list: prefer scan_iter() for large namespaces.
+
+        Args:
+            pattern: Key pattern (default: all keys)
+
+        Returns:
+            List of matching keys
+        """
+        return [key async for key in self.scan_iter(pattern)]
 
     async def flush_db(self) -> bool:
         """
@@ -216,7 +1071,7 @@ class RedisCache:
         Returns:
             True if successful, False otherwise
         """
-        if not self._connected:
+        if not self.is_connected():
             return False
 
         try:
@@ -225,9 +1080,49 @@ class RedisCache:
             return True
 
         except RedisError as e:
+            self._record_error(e)
             logger.error(f"Redis FLUSHDB error: {e}")
             return False
 
+    @staticmethod
+    def get_client_stats(namespace: str) -> Dict[str, Any]:
+        """
+        Client-side stats for one key namespace (this process only)
+
+        Args:
+            namespace: Key prefix, e.g. "session"
+
+        Returns:
+            Hits/misses/errors, hit ratio of reads, latency and codec percentiles
+        """
+        results: Dict[str, float] = {}
+        for labels, value in _requests.items():
+            labels = dict(labels)
+            if labels["namespace"] != namespace:
+                continue
+            # Hits/misses of reads only; errors of every op
+            if labels["result"] in ("hit", "miss") and labels["op"] not in _READ_OPS:
+                continue
+            results[labels["result"]] = results.get(labels["result"], 0) + value
+
+        reads = results.get("hit", 0) + results.get("miss", 0)
+        return {
+            "hits": results.get("hit", 0),
+            "misses": results.get("miss", 0),
+            "errors": results.get("error", 0),
+            "hit_ratio": results.get("hit", 0) / reads if reads else None,
+            "latency": {
+                labels["op"]: _latency.snapshot(**labels)
+                for labels in _latency.label_sets()
+                if labels["namespace"] == namespace
+            },
+            "codec": {
+                labels["direction"]: _codec_time.snapshot(**labels)
+                for labels in _codec_time.label_sets()
+                if labels["namespace"] == namespace
+            }
+        }
+
     async def get_stats(self) -> Dict[str, Any]:
         """
         Get Redis statistics
@@ -235,16 +1130,18 @@ class RedisCache:
         Returns:
             Dictionary with stats
         """
-        if not self._connected:
+        if not self.is_connected():
             return {
                 "connected": False,
-                "error": "Not connected to Redis"
+                "error": "Not connected to Redis",
+                "circuit": self.get_health()
             }
 
         try:
             info = await self.redis.info()
             return {
                 "connected": True,
+                "circuit": self.get_health(),
                 "used_memory": info.get("used_memory_human", "N/A"),
                 "connected_clients": info.get("connected_clients", 0),
                 "total_commands_processed": info.get("total_commands_processed", 0),
@@ -254,6 +1151,7 @@ class RedisCache:
             }
 
         except RedisError as e:
+            self._record_error(e)
             logger.error(f"Redis INFO error: {e}")
             return {
                 "connected": False,
@@ -261,11 +1159,322 @@ class RedisCache:
             }
 
 
+def _node_name(redis_url: str) -> str:
+    """Stable ring identity of a node: host:port/db (credentials don't move keys)"""
+    parts = urlsplit(redis_url)
+    return f"{parts.hostname or 'localhost'}:{parts.port or 6379}{parts.path or '/0'}"
+
+
+class ShardedBatch:
+    """
+    CacheBatch over several nodes: one pipeline per node, sent concurrently
+
+    Results are reassembled in command order; multi-key DELETE spanning
+    nodes returns the summed count. MULTI/EXEC only works within one node.
+    """
+
+    def __init__(self, cache: "ShardedRedisCache", transaction: bool = False):
+        self._cache = cache
+        self._transaction = transaction
+        self._batches: Dict[str, CacheBatch] = {}
+        # per command: [(node batch, index in it), ...]
+        self._slots: List[List[tuple]] = []
+        self.results: List[Any] = []
+        self.ok = False
+
+    def _batch(self, key: str) -> CacheBatch:
+        name = self._cache.ring.get_node(key)
+        batch = self._batches.get(name)
+        if batch is None:
+            if self._transaction and self._batches:
+                raise ValueError("Transactional batch keys must live on one Redis node (use {hash tags})")
+            batch = self._batches[name] = CacheBatch(self._cache.nodes[name], transaction=self._transaction)
+        return batch
+
+    def _queue(self, key: str, method: str, *args, **kwargs) -> "ShardedBatch":
+        batch = self._batch(key)
+        self._slots.append([(batch, len(batch._decoders))])
+        getattr(batch, method)(key, *args, **kwargs)
+        return self
+
+    def get(self, key: str) -> "ShardedBatch":
+        return self._queue(key, "get")
+
+    def set(self, key: str, value: Any, ttl: int = 86400) -> "ShardedBatch":
+        return self._queue(key, "set", value, ttl)
+
+    def delete(self, *keys: str) -> "ShardedBatch":
+        by_batch: Dict[int, tuple] = {}
+        for key in keys:
+            batch = self._batch(key)
+            by_batch.setdefault(id(batch), (batch, []))[1].append(key)
+        slot = []
+        for batch, batch_keys in by_batch.values():
+            slot.append((batch, len(batch._decoders)))
+            batch.delete(*batch_keys)
+        self._slots.append(slot)
+        return self
+
+    def exists(self, key: str) -> "ShardedBatch":
+        return self._queue(key, "exists")
+
+    def expire(self, key: str, ttl: int) -> "ShardedBatch":
+        return self._queue(key, "expire", ttl)
+
+    def hgetall(self, key: str) -> "ShardedBatch":
+        return self._queue(key, "hgetall")
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> "ShardedBatch":
+        return self._queue(key, "hset", mapping)
+
+    async def execute(self) -> List[Any]:
+        """Send every node's pipeline concurrently; results in command order"""
+        batches = list(self._batches.values())
+        await asyncio.gather(*(batch.execute() for batch in batches))
+
+        self.results = []
+        for slot in self._slots:
+            if len(slot) == 1:
+                batch, index = slot[0]
+                self.results.append(batch.results[index])
+            else:
+                counts = [batch.results[index] for batch, index in slot]
+                self.results.append(sum(counts) if all(c is not None for c in counts) else None)
+        self.ok = bool(batches) and all(batch.ok for batch in batches)
+        return self.results
+
+
+class ShardedRedisCache:
+    """
+    RedisCache over several Redis nodes (client-side sharding, no Redis Cluster)
+
+    Keys are routed with a consistent hash ring, so adding or removing a node
+    moves only ~1/N of the keys. Every node has its own connection pool and
+    circuit breaker: keys on an unhealthy node fail fast to the Supabase
+    fallback (they are not rerouted, which would serve stale copies once the
+    node is back), keys on healthy nodes are unaffected.
+
+    Same interface as RedisCache; pass the key to is_connected(key) to check
+    the node that owns it.
+    """
+
+    def __init__(
+        self,
+        redis_urls: List[str],
+        codec: Optional[Codec] = None,
+        vnodes: int = REDIS_VIRTUAL_NODES
+    ):
+        self.codec = codec or get_codec()
+        self.nodes: Dict[str, RedisCache] = {}
+        self.ring = HashRing(vnodes=vnodes)
+        for redis_url in redis_urls:
+            self._add(redis_url)
+
+    def _add(self, redis_url: str) -> RedisCache:
+        name = _node_name(redis_url)
+        node = self.nodes[name] = RedisCache(redis_url, codec=self.codec)
+        self.ring.add_node(name)
+        return node
+
+    def node_for(self, key: str) -> RedisCache:
+        """Node owning a key"""
+        return self.nodes[self.ring.get_node(key)]
+
+    def _group(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            groups.setdefault(self.ring.get_node(key), []).append(key)
+        return groups
+
+    async def connect(self) -> bool:
+        """Connect every node (failed nodes keep reconnecting in background)"""
+        results = await asyncio.gather(*(node.connect() for node in self.nodes.values()))
+        logger.info(f"Redis shards: {sum(results)}/{len(results)} nodes connected")
+        return any(results)
+
+    async def disconnect(self):
+        await asyncio.gather(*(node.disconnect() for node in self.nodes.values()))
+
+    async def add_node(self, redis_url: str) -> bool:
+        """
+        Add a node at runtime (~1/N of keys now map to it and start as misses)
+
+        Returns:
+            True if the node connected
+        """
+        if _node_name(redis_url) in self.nodes:
+            return self.nodes[_node_name(redis_url)].is_connected()
+        return await self._add(redis_url).connect()
+
+    async def remove_node(self, redis_url: str) -> None:
+        """Remove a node at runtime (its keys move to the neighbours as misses)"""
+        node = self.nodes.pop(_node_name(redis_url), None)
+        if node:
+            self.ring.remove_node(_node_name(redis_url))
+            await node.disconnect()
+
+    def is_connected(self, key: Optional[str] = None) -> bool:
+        """Node for `key` is healthy; without a key: any node is healthy"""
+        if key is not None:
+            return self.node_for(key).is_connected()
+        return any(node.is_connected() for node in self.nodes.values())
+
+    def get_health(self) -> Dict[str, Any]:
+        return {name: node.get_health() for name, node in self.nodes.items()}
+
+    # Single-key operations: routed to the owning node
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self.node_for(key).get(key)
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: int = 86400) -> bool:
+        return await self.node_for(key).set(key, value, ttl)
+
+    async def delete(self, key: str) -> bool:
+        return await self.node_for(key).delete(key)
+
+    async def exists(self, key: str) -> bool:
+        return await self.node_for(key).exists(key)
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        return await self.node_for(key).expire(key, ttl)
+
+    async def hgetall(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self.node_for(key).hgetall(key)
+
+    async def hmget(self, key: str, fields: List[str]) -> Optional[List[Any]]:
+        return await self.node_for(key).hmget(key, fields)
+
+    async def replace_hash(self, key: str, mapping: Dict[str, Any], ttl: int = 86400) -> bool:
+        return await self.node_for(key).replace_hash(key, mapping, ttl)
+
+    async def update_hash(
+        self,
+        key: str,
+        mapping: Dict[str, Any],
+        ttl: int = 86400,
+        delete_fields: Iterable[str] = ()
+    ) -> bool:
+        return await self.node_for(key).update_hash(key, mapping, ttl, delete_fields)
+
+    async def acquire_lock(self, name: str, ttl: int) -> Optional[str]:
+        return await self.node_for(name).acquire_lock(name, ttl)
+
+    async def extend_lock(self, name: str, token: str, ttl: int) -> bool:
+        return await self.node_for(name).extend_lock(name, token, ttl)
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        return await self.node_for(name).release_lock(name, token)
+
+    # Channels live on the node owning the channel name (same for every instance)
+
+    async def publish(self, channel: str, message: Any) -> int:
+        return await self.node_for(channel).publish(channel, message)
+
+    def subscribe(
+        self,
+        channel: str,
+        handler: Callable[[Any], None],
+        on_state: Optional[Callable[[bool], None]] = None
+    ) -> asyncio.Task:
+        return self.node_for(channel).subscribe(channel, handler, on_state)
+
+    # Multi-key operations: grouped per node, nodes queried concurrently
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        groups = self._group(keys)
+        found = {}
+        for part in await asyncio.gather(*(self.nodes[name].get_many(group) for name, group in groups.items())):
+            found.update(part)
+        return found
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: int = 86400) -> bool:
+        groups = self._group(mapping)
+        results = await asyncio.gather(*(
+            self.nodes[name].set_many({key: mapping[key] for key in group}, ttl)
+            for name, group in groups.items()
+        ))
+        return all(results)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        groups = self._group(keys)
+        return sum(await asyncio.gather(*(self.nodes[name].delete_many(group) for name, group in groups.items())))
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[ShardedBatch]:
+        """Batch commands; one pipeline per node, sent concurrently on exit"""
+        batch = ShardedBatch(self, transaction=transaction)
+        try:
+            yield batch
+            await batch.execute()
+        finally:
+            for node_batch in batch._batches.values():
+                if node_batch._pipe is not None:
+                    await node_batch._pipe.reset()
+
+    # Keyspace operations: every node
+
+    async def scan_batches(
+        self,
+        pattern: str = "*",
+        count: int = 500,
+        key_type: Optional[str] = None
+    ) -> AsyncIterator[List[str]]:
+        for node in list(self.nodes.values()):
+            async for keys in node.scan_batches(pattern, count, key_type):
+                yield keys
+
+    async def scan_iter(
+        self,
+        pattern: str = "*",
+        count: int = 500,
+        key_type: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        async for keys in self.scan_batches(pattern, count, key_type):
+            for key in keys:
+                yield key
+
+    async def count_keys(self, pattern: str = "*", key_type: Optional[str] = None) -> int:
+        return sum(await asyncio.gather(*(
+            node.count_keys(pattern, key_type) for node in self.nodes.values()
+        )))
+
+    async def expire_keys(self, pattern: str, ttl: int, key_type: Optional[str] = None) -> int:
+        return sum(await asyncio.gather(*(
+            node.expire_keys(pattern, ttl, key_type) for node in self.nodes.values()
+        )))
+
+    async def delete_keys(self, pattern: str, key_type: Optional[str] = None) -> int:
+        return sum(await asyncio.gather(*(
+            node.delete_keys(pattern, key_type) for node in self.nodes.values()
+        )))
+
+    async def keys(self, pattern: str = "*") -> list:
+        return [key async for key in self.scan_iter(pattern)]
+
+    async def flush_db(self) -> bool:
+        return all(await asyncio.gather(*(node.flush_db() for node in self.nodes.values())))
+
+    get_client_stats = staticmethod(RedisCache.get_client_stats)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Per-node stats plus the number of healthy nodes"""
+        names = list(self.nodes)
+        stats = await asyncio.gather(*(self.nodes[name].get_stats() for name in names))
+        healthy = sum(1 for node in self.nodes.values() if node.is_connected())
+        return {
+            "connected": healthy > 0,
+            "nodes_healthy": healthy,
+            "nodes_total": len(names),
+            "nodes": dict(zip(names, stats))
+        }
+
+
 # Singleton instance
-_redis_cache: Optional[RedisCache] = None
+_redis_cache: Optional[Union[RedisCache, ShardedRedisCache]] = None
 
 
-async def get_redis_cache() -> Optional[RedisCache]:
+async def get_redis_cache() -> Optional[Union[RedisCache, ShardedRedisCache]]:
     """
     Get Redis cache singleton instance
 
@@ -276,15 +1485,20 @@ async def get_redis_cache() -> Optional[RedisCache]:
     return _redis_cache
 
 
-async def init_redis_cache(redis_url: Optional[str]) -> Optional[RedisCache]:
+async def init_redis_cache(
+    redis_url: Union[str, List[str], None],
+    codec: Optional[str] = None
+) -> Optional[Union[RedisCache, ShardedRedisCache]]:
     """
     Initialize Redis cache
 
     Args:
-        redis_url: Redis connection URL or None to disable
+        redis_url: Redis connection URL, list of node URLs (sharded by
+            consistent hashing) or None to disable
+        codec: Value codec name ("msgpack" or "json", default from REDIS_CODEC)
 
     Returns:
-        RedisCache instance or None
+        RedisCache (one node), ShardedRedisCache (several nodes) or None
     """
     global _redis_cache
 
@@ -292,12 +1506,16 @@ async def init_redis_cache(redis_url: Optional[str]) -> Optional[RedisCache]:
         logger.info("Redis caching disabled (no REDIS_URL provided)")
         return None
 
-    _redis_cache = RedisCache(redis_url)
+    redis_urls = [redis_url] if isinstance(redis_url, str) else list(redis_url)
+    if len(redis_urls) == 1:
+        _redis_cache = RedisCache(redis_urls[0], codec=get_codec(codec or REDIS_CODEC))
+    else:
+        _redis_cache = ShardedRedisCache(redis_urls, codec=get_codec(codec or REDIS_CODEC))
     connected = await _redis_cache.connect()
 
     if not connected:
-        logger.warning("Redis cache initialization failed, continuing without cache")
-        _redis_cache = None
+        # Keep the instance: it fails fast now and reconnects in the background
+        logger.warning("Redis cache unavailable at startup, continuing with Supabase and retrying")
 
     return _redis_cache
 
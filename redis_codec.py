@@ -0,0 +1,169 @@
+"""
+Value codecs for RedisCache
+Pluggable serialization with a versioned header for rolling upgrades
+
+Wire format:
+- Legacy JSON: plain UTF-8 JSON text (no header, lossy: datetime → str)
+- Headered:    b"\\x00" + format byte + payload
+
+JSON text never starts with a NUL byte, so every reader can tell the formats
+apart. Readers always understand all formats; REDIS_CODEC only selects what is
+written. Roll out a new format by deploying readers first, then switching writers.
+"""
+import json
+import logging
+import struct
+from datetime import datetime, date, timedelta, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+HEADER_MAGIC = b"\x00"
+
+# Format bytes (never reuse a retired value)
+FORMAT_MSGPACK_V1 = 1
+
+# msgpack extension type codes
+_EXT_DATETIME = 1
+_EXT_UUID = 2
+_EXT_DATE = 3
+
+_EPOCH = datetime(1970, 1, 1)
+_NAIVE_OFFSET = -32768  # utcoffset marker for naive datetimes
+_DATETIME_STRUCT = struct.Struct(">qh")  # wall-clock microseconds since epoch, offset minutes
+
+
+class Codec:
+    """Base codec: bytes in Redis ↔ Python values"""
+
+    name = "base"
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """Legacy JSON text (datetime/UUID become strings)"""
+
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+def _msgpack_default(value: Any):
+    """Encode non-native types as msgpack extensions"""
+    if isinstance(value, datetime):
+        offset = value.utcoffset()
+        offset_minutes = _NAIVE_OFFSET if offset is None else int(offset.total_seconds() // 60)
+        wall = value.replace(tzinfo=None) - _EPOCH
+        micros = (wall.days * 86400 + wall.seconds) * 1_000_000 + wall.microseconds
+        return msgpack.ExtType(_EXT_DATETIME, _DATETIME_STRUCT.pack(micros, offset_minutes))
+    if isinstance(value, UUID):
+        return msgpack.ExtType(_EXT_UUID, value.bytes)
+    if isinstance(value, date):
+        return msgpack.ExtType(_EXT_DATE, struct.pack(">i", value.toordinal()))
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # Same fallback as the JSON codec
+    return str(value)
+
+
+def _msgpack_ext_hook(code: int, payload: bytes):
+    """Decode msgpack extensions back into Python types"""
+    if code == _EXT_DATETIME:
+        micros, offset_minutes = _DATETIME_STRUCT.unpack(payload)
+        value = _EPOCH + timedelta(microseconds=micros)
+        if offset_minutes != _NAIVE_OFFSET:
+            value = value.replace(tzinfo=timezone(timedelta(minutes=offset_minutes)))
+        return value
+    if code == _EXT_UUID:
+        return UUID(bytes=payload)
+    if code == _EXT_DATE:
+        return date.fromordinal(struct.unpack(">i", payload)[0])
+    return msgpack.ExtType(code, payload)
+
+
+class MsgpackCodec(Codec):
+    """Compact binary, type-preserving (datetime with offset, date, UUID)"""
+
+    name = "msgpack"
+    format_byte = FORMAT_MSGPACK_V1
+
+    def __init__(self):
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        self._header = HEADER_MAGIC + bytes([self.format_byte])
+
+    def encode(self, value: Any) -> bytes:
+        return self._header + msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(
+            memoryview(data)[2:],
+            ext_hook=_msgpack_ext_hook,
+            raw=False,
+            strict_map_key=False
+        )
+
+
+class VersionedCodec(Codec):
+    """
+    Writes with one codec, reads every known format
+
+    Args:
+        writer: Codec used for encoding
+    """
+
+    def __init__(self, writer: Codec):
+        self.writer = writer
+        self.name = writer.name
+        self._json = JsonCodec()
+        self._readers: Dict[int, Codec] = {}
+        if msgpack is not None:
+            self._readers[FORMAT_MSGPACK_V1] = writer if isinstance(writer, MsgpackCodec) else MsgpackCodec()
+
+    def encode(self, value: Any) -> bytes:
+        return self.writer.encode(value)
+
+    def decode(self, data: bytes) -> Any:
+        if data[:1] != HEADER_MAGIC:
+            return self._json.decode(data)
+
+        reader = self._readers.get(data[1]) if len(data) > 1 else None
+        if reader is None:
+            raise ValueError(f"Unknown Redis value format: {data[1:2]!r}")
+        return reader.decode(data)
+
+
+def get_codec(name: Optional[str] = None) -> VersionedCodec:
+    """
+    Build the codec for RedisCache
+
+    Args:
+        name: "msgpack" (default) or "json"
+
+    Returns:
+        Codec that writes `name` and reads all formats
+    """
+    name = (name or "msgpack").lower()
+    if name == "msgpack":
+        if msgpack is None:
+            logger.warning("⚠️ msgpack not installed, falling back to JSON Redis codec")
+            return VersionedCodec(JsonCodec())
+        return VersionedCodec(MsgpackCodec())
+    if name == "json":
+        return VersionedCodec(JsonCodec())
+    raise ValueError(f"Unknown Redis codec: {name}")
@@ -0,0 +1,426 @@
+"""
+Event reminders for DrAivBot
+Persistent, multi-instance scheduler delivering `reminder_minutes` notifications
+
+Every REMINDER_POLL_INTERVAL seconds each instance claims the reminders due
+within the next REMINDER_WINDOW seconds (FOR UPDATE SKIP LOCKED: instances
+never claim the same rows) and keeps them in an in-memory heap until they
+fire. A claim is a lease: reminders of an instance that died are claimed
+again by another one once the lease runs out. Before a reminder is sent the
+row is marked (`reminder_at` cleared, `reminder_sent_for` set) under the
+claim, so a restart or a second instance never sends it twice. For a
+recurring event the same update moves `reminder_at` to the next occurrence
+(see bot.core.recurrence), so a series only ever has one pending reminder.
+A failed send puts `reminder_at` back, REMINDER_RETRY_BACKOFF seconds later
+(doubled per attempt, at most REMINDER_MAX_ATTEMPTS sends); the retry is a
+reminder for the occurrence in `reminder_sent_for`.
+
+Per tick the cost depends only on the reminders of the current window: the
+claim query walks the partial index of pending reminders, the heap only
+holds claimed ones.
+
+Schema (events):
+    ALTER TABLE events
+        ADD COLUMN reminder_at timestamptz,           -- next reminder (NULL = none pending)
+        ADD COLUMN reminder_sent_for timestamptz,     -- event_date the last reminder was sent for
+        ADD COLUMN reminder_attempts int NOT NULL DEFAULT 0,  -- failed sends (reminder_at is a retry)
+        ADD COLUMN reminder_claimed_by text,
+        ADD COLUMN reminder_lease_until timestamptz;
+    UPDATE events
+    SET reminder_at = event_date - make_interval(mins => reminder_minutes)
+    WHERE reminder_minutes IS NOT NULL AND event_date > NOW();
+    CREATE INDEX events_reminder_due_idx ON events (reminder_at)
+        WHERE reminder_at IS NOT NULL;
+"""
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+from bot.config import (
+    REMINDER_WINDOW,
+    REMINDER_POLL_INTERVAL,
+    REMINDER_CLAIM_BATCH_SIZE,
+    REMINDER_SEND_CONCURRENCY,
+    REMINDER_MAX_ATTEMPTS,
+    REMINDER_RETRY_BACKOFF,
+    RECURRENCE_ENABLED,
+    DEFAULT_LANGUAGE
+)
+from bot.core.database import get_pool
+from bot.core.metrics import REGISTRY
+from bot.core.notifications import NotificationManager
+from bot.core.recurrence import next_reminder, occurrence_for_reminder, occurrence_starting_at
+from bot.utils.texts import get_text
+
+logger = logging.getLogger(__name__)
+
+_reminders = REGISTRY.counter(
+    "reminders_total", "Reminders by outcome", ["result"]
+)
+_reminder_lateness = REGISTRY.histogram(
+    "reminder_lateness_seconds", "Delivery time minus reminder time",
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+)
+_reminders_claimed = REGISTRY.gauge(
+    "reminders_scheduled", "Claimed reminders waiting in this instance's heap"
+)
+
+# Series fields (see bot.core.database: no recurrence_* columns unless
+# RECURRENCE_ENABLED)
+if RECURRENCE_ENABLED:
+    _RECURRENCE_COLUMNS = "e.recurrence_rule, e.recurrence_timezone, e.recurrence_exceptions"
+else:
+    _RECURRENCE_COLUMNS = "NULL AS recurrence_rule, NULL AS recurrence_timezone, NULL AS recurrence_exceptions"
+
+# Reminders due before the window end that nobody holds a live lease on.
+# Users are joined before the LIMIT: rows without a user (never claimable)
+# must not take up the batch
+_CLAIM_QUERY = f"""
+    WITH due AS (
+        SELECT ev.id
+        FROM events ev
+        JOIN users ON users.id = ev.user_id
+        WHERE ev.reminder_at IS NOT NULL
+          AND ev.reminder_at < NOW() + make_interval(secs => $1)
+          AND (ev.reminder_lease_until IS NULL OR ev.reminder_lease_until < NOW())
+        ORDER BY ev.reminder_at
+        LIMIT $2
+        FOR UPDATE OF ev SKIP LOCKED
+    )
+    UPDATE events e
+    SET reminder_claimed_by = $3,
+        reminder_lease_until = NOW() + make_interval(secs => $4)
+    FROM due, users u
+    WHERE e.id = due.id AND u.id = e.user_id
+    RETURNING e.id, e.title, e.event_date, e.reminder_at, e.reminder_minutes,
+              e.reminder_sent_for, e.reminder_attempts,
+              {_RECURRENCE_COLUMNS},
+              u.telegram_id, u.language, u.timezone
+"""
+
+# Only the claim holder can mark a reminder, and only the one it claimed
+# (reminder_at changes if the event was rescheduled meanwhile). $4 is the
+# next occurrence's reminder of a series (NULL for single events)
+_MARK_SENT_QUERY = """
+    UPDATE events
+    SET reminder_at = $4,
+        reminder_sent_for = COALESCE($5, reminder_sent_for),
+        reminder_attempts = 0,
+        reminder_claimed_by = NULL,
+        reminder_lease_until = NULL
+    WHERE id = $1::uuid AND reminder_claimed_by = $2 AND reminder_at = $3
+"""
+
+# Failed send: the reminder comes back at $4, unless the row moved on since
+# it was marked ($2 the reminder_at the mark set, $3 the occurrence sent for)
+_RETRY_QUERY = """
+    UPDATE events
+    SET reminder_at = $4, reminder_attempts = $5
+    WHERE id = $1::uuid
+      AND reminder_claimed_by IS NULL
+      AND reminder_at IS NOT DISTINCT FROM $2
+      AND reminder_sent_for = $3
+"""
+
+_RELEASE_QUERY = """
+    UPDATE events
+    SET reminder_claimed_by = NULL, reminder_lease_until = NULL
+    WHERE reminder_claimed_by = $1 AND reminder_at IS NOT NULL
+"""
+
+
+@dataclass(order=True)
+class Reminder:
+    """A claimed reminder (heap entries order by due time)"""
+    due: float
+    event_id: str = field(compare=False)
+    reminder_at: datetime = field(compare=False)
+    event_date: Optional[datetime] = field(compare=False)  # None: occurrence no longer exists
+    title: str = field(compare=False)
+    reminder_minutes: Optional[int] = field(compare=False)
+    telegram_id: int = field(compare=False)
+    language: str = field(compare=False)
+    timezone: Optional[str] = field(compare=False)
+    attempts: int = field(compare=False, default=0)  # failed sends so far
+    next_reminder_at: Optional[datetime] = field(compare=False, default=None)
+
+    @classmethod
+    def from_row(cls, row) -> "Reminder":
+        reminder = cls(
+            due=row['reminder_at'].timestamp(),
+            event_id=str(row['id']),
+            reminder_at=row['reminder_at'],
+            event_date=row['event_date'],
+            title=row['title'],
+            reminder_minutes=row['reminder_minutes'],
+            telegram_id=row['telegram_id'],
+            language=row['language'] or DEFAULT_LANGUAGE,
+            timezone=row['timezone'],
+            attempts=row['reminder_attempts']
+        )
+        if row['recurrence_rule']:
+            reminder._resolve_occurrence(row)
+        return reminder
+
+    def _resolve_occurrence(self, row) -> None:
+        """Point a series reminder at its occurrence and find the next one"""
+        series = {
+            "event_date": row['event_date'],
+            "title": row['title'],
+            "reminder_minutes": row['reminder_minutes'],
+            "recurrence_rule": row['recurrence_rule'],
+            "recurrence_timezone": row['recurrence_timezone'],
+            "recurrence_exceptions": row['recurrence_exceptions']
+        }
+        if self.attempts:
+            # Retry: reminder_at is the retry time, not the occurrence's
+            occurrence = occurrence_starting_at(series, row['reminder_sent_for'])
+        else:
+            occurrence = occurrence_for_reminder(series, self.reminder_at)
+        after = datetime.now(timezone.utc)
+        if occurrence is None:
+            self.event_date = None
+        else:
+            self.event_date = occurrence["event_date"]
+            self.title = occurrence["title"]
+            self.reminder_minutes = occurrence["reminder_minutes"]
+            after = max(after, occurrence["event_date"])
+
+        upcoming = next_reminder(series, after)
+        self.next_reminder_at = upcoming[0] if upcoming else None
+
+
+def format_reminder(reminder: Reminder) -> str:
+    """Reminder text in the user's language, time in the user's timezone"""
+    try:
+        tz = ZoneInfo(reminder.timezone) if reminder.timezone else timezone.utc
+    except (KeyError, ValueError):
+        tz = timezone.utc
+    return get_text(reminder.language, "event_reminder").format(
+        title=reminder.title,
+        time=reminder.event_date.astimezone(tz).strftime("%d.%m.%Y %H:%M"),
+        minutes=reminder.reminder_minutes or 0
+    )
+
+
+class ReminderScheduler:
+    """
+    Claims due reminders in sliding windows and fires them on time
+
+    Args:
+        notifications: Delivery channel
+        window: Seconds ahead claimed per poll
+        poll_interval: Seconds between claims (smaller than window, so
+            consecutive windows overlap)
+        batch_size: Max reminders claimed per poll
+    """
+
+    def __init__(
+        self,
+        notifications: NotificationManager,
+        window: float = REMINDER_WINDOW,
+        poll_interval: float = REMINDER_POLL_INTERVAL,
+        batch_size: int = REMINDER_CLAIM_BATCH_SIZE
+    ):
+        self.notifications = notifications
+        self.window = window
+        self.poll_interval = min(poll_interval, window / 2)
+        self.batch_size = batch_size
+        # Covers the window plus a missed poll; expired leases are taken over
+        self.lease = window + 2 * self.poll_interval
+        self.instance_id = uuid.uuid4().hex
+
+        self._heap: List[Reminder] = []
+        self._scheduled: Dict[str, float] = {}  # event_id -> due (heap members)
+        self._wakeup = asyncio.Event()
+        self._send_slots = asyncio.Semaphore(REMINDER_SEND_CONCURRENCY)
+        self._tasks: List[asyncio.Task] = []
+        self._deliveries: set = set()
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._claim_loop()),
+            asyncio.create_task(self._fire_loop())
+        ]
+
+    async def stop(self) -> None:
+        """Stop, wait for deliveries in progress and hand unsent claims back"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+        self._heap.clear()
+        self._scheduled.clear()
+        _reminders_claimed.set(0)
+        try:
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute(_RELEASE_QUERY, self.instance_id)
+        except Exception as e:
+            # Leases expire on their own
+            logger.warning(f"⚠️ Failed to release reminder claims: {e}")
+
+    async def claim(self) -> int:
+        """
+        Claim reminders of the next window and schedule them
+
+        Returns:
+            Number of newly scheduled reminders
+        """
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                _CLAIM_QUERY, float(self.window), self.batch_size, self.instance_id, float(self.lease)
+            )
+
+        # Series rows expand their rule: keep that CPU work off the event loop
+        reminders = await asyncio.to_thread(lambda: [Reminder.from_row(row) for row in rows])
+
+        scheduled = 0
+        for reminder in reminders:
+            # Re-claimed by this instance (lease renewal): already in the heap
+            if self._scheduled.get(reminder.event_id) == reminder.due:
+                continue
+            self._scheduled[reminder.event_id] = reminder.due
+            heapq.heappush(self._heap, reminder)
+            scheduled += 1
+
+        if scheduled:
+            _reminders_claimed.set(len(self._scheduled))
+            self._wakeup.set()
+            logger.debug(f"⏰ Claimed {scheduled} reminders")
+        return scheduled
+
+    async def _claim_loop(self):
+        while True:
+            try:
+                claimed = await self.claim()
+            except Exception as e:
+                logger.error(f"❌ Error claiming reminders: {e}")
+                claimed = 0
+            # A full batch means more is due in this window: claim again right away
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _fire_loop(self):
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            while self._heap and self._heap[0].due <= now:
+                reminder = heapq.heappop(self._heap)
+                # Superseded by a newer claim of the same event
+                if self._scheduled.get(reminder.event_id) != reminder.due:
+                    continue
+                del self._scheduled[reminder.event_id]
+                task = asyncio.create_task(self._deliver(reminder))
+                self._deliveries.add(task)
+                task.add_done_callback(self._deliveries.discard)
+            _reminders_claimed.set(len(self._scheduled))
+
+            timeout = self._heap[0].due - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _deliver(self, reminder: Reminder) -> None:
+        async with self._send_slots:
+            try:
+                pool = await get_pool()
+                async with pool.acquire() as conn:
+                    status = await conn.execute(
+                        _MARK_SENT_QUERY, reminder.event_id, self.instance_id, reminder.reminder_at,
+                        reminder.next_reminder_at, reminder.event_date
+                    )
+            except Exception as e:
+                # Still claimed: retried by whoever claims it after the lease
+                _reminders.inc(result="error")
+                logger.error(f"❌ Error marking reminder {reminder.event_id}: {e}")
+                return
+
+            if status.split()[-1] == "0" or reminder.event_date is None:
+                # Lease lost, event rescheduled or deleted
+                _reminders.inc(result="lost")
+                return
+
+            if reminder.event_date.timestamp() <= time.time():
+                # Event already started (instance was down): too late to remind
+                _reminders.inc(result="expired")
+                return
+
+            _reminder_lateness.observe(max(0.0, time.time() - reminder.due))
+            sent = await self.notifications.send_notification(reminder.telegram_id, format_reminder(reminder))
+            _reminders.inc(result="sent" if sent else "failed")
+            if not sent:
+                await self._retry(reminder)
+
+    async def _retry(self, reminder: Reminder) -> None:
+        """Put a reminder whose send failed back, with exponential backoff"""
+        attempts = reminder.attempts + 1
+        if attempts >= REMINDER_MAX_ATTEMPTS:
+            logger.warning(f"⚠️ Giving up reminder {reminder.event_id} after {attempts} failed sends")
+            return
+
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=REMINDER_RETRY_BACKOFF * 2 ** reminder.attempts)
+        if retry_at >= reminder.event_date:
+            # Would arrive after the event started
+            return
+        try:
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    _RETRY_QUERY, reminder.event_id, reminder.next_reminder_at, reminder.event_date,
+                    retry_at, attempts
+                )
+        except Exception as e:
+            logger.error(f"❌ Error rescheduling reminder {reminder.event_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "instance_id": self.instance_id,
+            "scheduled": len(self._scheduled),
+            "next_due": self._heap[0].reminder_at if self._heap else None,
+            "delivering": len(self._deliveries),
+            "window": self.window,
+            "poll_interval": self.poll_interval
+        }
+
+
+# Global scheduler instance
+_scheduler: Optional[ReminderScheduler] = None
+
+
+async def init_reminder_scheduler(notifications: NotificationManager) -> ReminderScheduler:
+    """Start the reminder scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ReminderScheduler(notifications)
+        _scheduler.start()
+        logger.info(
+            f"✅ Reminder scheduler started (window {_scheduler.window:.0f}s, "
+            f"poll every {_scheduler.poll_interval:.0f}s)"
+        )
+    return _scheduler
+
+
+def get_reminder_scheduler() -> Optional[ReminderScheduler]:
+    """Get the reminder scheduler (None if not started)"""
+    return _scheduler
+
+
+async def close_reminder_scheduler():
+    """Stop the reminder scheduler and release its claims"""
+    global _scheduler
+    if _scheduler:
+        await _scheduler.stop()
+        _scheduler = None
+        logger.info("Reminder scheduler stopped")
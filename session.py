@@ -5,20 +5,330 @@ Hybrid approach: Redis cache + Supabase persistent storage
 Architecture:
 - Hot sessions → Redis (fast access)
 - Cold sessions → Supabase (persistent backup)
-- Automatic sync between Redis and Supabase
+- Write-through: updates are written into Redis immediately
+- Optional write-behind: Supabase writes coalesced per flush window
 - Graceful fallback if Redis unavailable
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 from datetime import datetime, timedelta
+import asyncio
+import copy
 import json
 import logging
+import time
+import uuid
 
 from bot.core.database import get_pool
 from bot.core.redis_cache import get_redis_cache
-from bot.config import SESSION_TIMEOUT_HOURS
+from bot.core.metrics import REGISTRY
+from bot.core.singleflight import SingleFlight
+from bot.core.local_cache import LocalCache
+from bot.config import (
+    SESSION_TIMEOUT_HOURS,
+    SESSION_WRITE_MODE,
+    SESSION_FLUSH_INTERVAL,
+    SESSION_FLUSH_MAX_PENDING,
+    SESSION_CLEANUP_BATCH_SIZE,
+    SESSION_LOCAL_CACHE_ENABLED,
+    SESSION_LOCAL_CACHE_SIZE,
+    SESSION_LOCAL_CACHE_TTL
+)
 
 logger = logging.getLogger(__name__)
 
+# Cleanup leadership: Redis lock for the whole sweep. Without Redis only each
+# batch is serialized (transaction-level advisory lock; session-level locks
+# are unsafe behind the transaction pooler), so instances may interleave
+# batches - harmless, SKIP LOCKED keeps them from deleting the same rows
+_CLEANUP_LOCK_KEY = "lock:session_cleanup"
+_CLEANUP_LOCK_TTL = 300  # seconds, extended after every batch
+_CLEANUP_ADVISORY_LOCK_ID = 0x5E551011
+
+# Bounded delete: SKIP LOCKED keeps batches from blocking live session updates
+_CLEANUP_BATCH_QUERY = """
+    DELETE FROM sessions
+    WHERE id IN (
+        SELECT id
+        FROM sessions
+        WHERE expires_at < NOW()
+        LIMIT $1
+        FOR UPDATE SKIP LOCKED
+    )
+"""
+
+_cleanup_rows = REGISTRY.counter(
+    "session_cleanup_rows_total", "Expired sessions deleted from Supabase"
+)
+_cleanup_runs = REGISTRY.counter(
+    "session_cleanup_runs_total", "Cleanup runs by outcome", ["result"]
+)
+_cleanup_duration = REGISTRY.histogram(
+    "session_cleanup_duration_seconds", "Time spent per cleanup sweep",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+
+# Where get_session was served from, and why Supabase had to answer
+_session_reads = REGISTRY.counter(
+    "session_reads_total", "get_session calls by source", ["source"]
+)
+_session_read_latency = REGISTRY.histogram(
+    "session_read_seconds", "get_session latency by source", ["source"]
+)
+_session_fallbacks = REGISTRY.counter(
+    "session_cache_fallbacks_total", "get_session calls answered by Supabase", ["reason"]
+)
+
+# Changes waiting for the next flush (deferred mode only)
+# telegram_id -> {"state", "user_id", "company_id", "data", "data_patch", "data_unset"}
+_pending_writes: Dict[int, Dict[str, Any]] = {}
+_flush_task: Optional[asyncio.Task] = None
+_flush_wakeup: Optional[asyncio.Event] = None
+_flush_stopping = False
+
+# Concurrent cache misses for the same telegram_id share one Supabase load
+_session_loads = SingleFlight("sessions")
+
+# Optional process-local L1 cache in front of Redis. Every write publishes the
+# telegram_id on the invalidation channel; L1 is only trusted while this
+# instance is subscribed (cleared whenever the subscription is re-established)
+_INVALIDATION_CHANNEL = "invalidate:session"
+_INSTANCE_ID = uuid.uuid4().hex
+_local_sessions: Optional[LocalCache] = None
+_local_active = False
+
+# Redis hash layout: one field per column, one "data:<key>" field per data key
+_META_FIELDS = ("id", "telegram_id", "user_id", "company_id", "state", "expires_at")
+_DATA_PREFIX = "data:"
+
+# One statement for every write (sync, patch and flush):
+# NULL column = unchanged; data = (replacement or current - removed keys) || patched keys
+_WRITE_QUERY = f"""
+    UPDATE sessions
+    SET state = COALESCE($2, state),
+        data = CASE
+            WHEN $3::jsonb IS NULL AND cardinality($4::text[]) = 0 AND $5::jsonb = '{{}}'::jsonb
+                THEN data
+            ELSE (COALESCE($3::jsonb, data, '{{}}'::jsonb) - $4::text[]) || $5::jsonb
+        END,
+        user_id = COALESCE($6::uuid, user_id),
+        company_id = COALESCE($7::uuid, company_id),
+        updated_at = NOW(),
+        expires_at = NOW() + INTERVAL '{SESSION_TIMEOUT_HOURS} hours'
+    WHERE telegram_id = $1
+    RETURNING id, user_id, company_id, state, expires_at
+"""
+
+
+# Get-or-create in one round-trip: a live row is only read (no write),
+# a missing or expired row is (re)created. Returns nothing only when a
+# concurrent request created the row first; re-running then finds it live.
+_GET_OR_CREATE_QUERY = f"""
+    WITH live AS (
+        SELECT id, user_id, company_id, state, data, expires_at
+        FROM sessions
+        WHERE telegram_id = $1
+          AND expires_at > NOW()
+    ),
+    created AS (
+        INSERT INTO sessions (telegram_id, state, data, expires_at)
+        SELECT $1, 'MENU', '{{}}'::jsonb, NOW() + INTERVAL '{SESSION_TIMEOUT_HOURS} hours'
+        WHERE NOT EXISTS (SELECT 1 FROM live)
+        ON CONFLICT (telegram_id) DO UPDATE
+        SET user_id = NULL,
+            company_id = NULL,
+            state = EXCLUDED.state,
+            data = EXCLUDED.data,
+            expires_at = EXCLUDED.expires_at,
+            updated_at = NOW()
+        WHERE sessions.expires_at <= NOW()
+        RETURNING id, user_id, company_id, state, data, expires_at
+    )
+    SELECT *, FALSE AS created FROM live
+    UNION ALL
+    SELECT *, TRUE AS created FROM created
+"""
+
+
+def _row_to_session(telegram_id: int, row, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Convert a `sessions` row into a session dictionary"""
+    if data is None:
+        data = row['data']
+        if isinstance(data, str):
+            # asyncpg returns jsonb as text unless a type codec is registered
+            data = json.loads(data)
+    return {
+        "id": str(row['id']),
+        "telegram_id": telegram_id,
+        "user_id": str(row['user_id']) if row['user_id'] else None,
+        "company_id": str(row['company_id']) if row['company_id'] else None,
+        "state": row['state'],
+        "data": data if data else {},
+        "expires_at": row['expires_at']
+    }
+
+
+def _merge_changes(base: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Coalesce two change sets (later wins)
+
+    A full data replacement absorbs earlier key patches; key patches on top
+    of a replacement are folded into it.
+    """
+    merged = dict(base)
+    if "data_patch" in merged:
+        merged["data_patch"] = dict(merged["data_patch"])
+    if "data_unset" in merged:
+        merged["data_unset"] = set(merged["data_unset"])
+
+    for column in ("state", "user_id", "company_id"):
+        if column in changes:
+            merged[column] = changes[column]
+
+    if "data" in changes:
+        merged["data"] = dict(changes["data"])
+        merged.pop("data_patch", None)
+        merged.pop("data_unset", None)
+
+    for key in changes.get("data_unset", ()):
+        if "data" in merged:
+            merged["data"].pop(key, None)
+        else:
+            merged.setdefault("data_unset", set()).add(key)
+            merged.get("data_patch", {}).pop(key, None)
+
+    for key, value in changes.get("data_patch", {}).items():
+        if "data" in merged:
+            merged["data"][key] = value
+        else:
+            merged.setdefault("data_patch", {})[key] = value
+            merged.get("data_unset", set()).discard(key)
+
+    return merged
+
+
+def _apply_changes(session: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a change set to a session dictionary (in place)"""
+    for column in ("state", "user_id", "company_id"):
+        if column in changes:
+            session[column] = changes[column]
+
+    data = dict(changes["data"]) if "data" in changes else dict(session.get("data") or {})
+    for key in changes.get("data_unset", ()):
+        data.pop(key, None)
+    data.update(changes.get("data_patch", {}))
+    session["data"] = data
+    return session
+
+
+def _write_params(telegram_id: int, changes: Dict[str, Any]) -> tuple:
+    """Build _WRITE_QUERY parameters from a change set"""
+    return (
+        telegram_id,
+        changes.get("state"),
+        json.dumps(changes["data"]) if "data" in changes else None,
+        list(changes.get("data_unset", ())),
+        json.dumps(changes.get("data_patch", {})),
+        changes.get("user_id"),
+        changes.get("company_id")
+    )
+
+
+def _session_to_hash(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a session into Redis hash fields"""
+    mapping = {field: session_data.get(field) for field in _META_FIELDS}
+    for key, value in (session_data.get("data") or {}).items():
+        mapping[_DATA_PREFIX + key] = value
+    return mapping
+
+
+def _hash_to_session(mapping: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Rebuild a session from Redis hash fields (None if incomplete)"""
+    if "telegram_id" not in mapping:
+        return None
+    session_data = {field: mapping.get(field) for field in _META_FIELDS}
+    session_data["data"] = {
+        field[len(_DATA_PREFIX):]: value
+        for field, value in mapping.items()
+        if field.startswith(_DATA_PREFIX)
+    }
+    return session_data
+
+
+def _changes_to_hash(changes: Dict[str, Any]) -> tuple:
+    """Translate a change set without full data replacement into hash field writes"""
+    mapping = {column: changes[column] for column in ("state", "user_id", "company_id") if column in changes}
+    for key, value in changes.get("data_patch", {}).items():
+        mapping[_DATA_PREFIX + key] = value
+    delete_fields = [_DATA_PREFIX + key for key in changes.get("data_unset", ())]
+    return mapping, delete_fields
+
+
+def _local_get(telegram_id: int) -> Optional[Dict[str, Any]]:
+    """L1 lookup (a private copy, None if disabled or missing)"""
+    if not _local_active:
+        return None
+    session_data = _local_sessions.get(telegram_id)
+    return copy.deepcopy(session_data) if session_data is not None else None
+
+
+def _local_begin_fill(telegram_id: int) -> Optional[int]:
+    return _local_sessions.begin_fill(telegram_id) if _local_active else None
+
+
+def _local_store(session_data: Dict[str, Any], token: Optional[int] = None) -> None:
+    if _local_active:
+        _local_sessions.set(session_data["telegram_id"], copy.deepcopy(session_data), token=token)
+
+
+def _local_apply(telegram_id: int, changes: Dict[str, Any], expires_at) -> None:
+    """Apply a change set to the L1 copy, if any"""
+    if not _local_active:
+        return
+    session_data = _local_sessions.peek(telegram_id)
+    if session_data is not None:
+        session_data = _apply_changes(copy.deepcopy(session_data), changes)
+        session_data["expires_at"] = expires_at
+        _local_sessions.set(telegram_id, session_data)
+
+
+def _on_invalidation(message: Any) -> None:
+    """Invalidation from another instance: drop the L1 copy"""
+    if isinstance(message, dict) and message.get("i") != _INSTANCE_ID:
+        _local_sessions.invalidate(message.get("k"))
+
+
+def _on_subscription_state(active: bool) -> None:
+    """(Re)subscribed or lost: invalidations may have been missed, start empty"""
+    global _local_active
+    _local_sessions.clear()
+    _local_active = active
+    logger.info(f"{'✅' if active else '⚠️'} Local session cache {'active' if active else 'suspended'}")
+
+
+async def _publish_invalidation(cache, telegram_id: int) -> None:
+    if _local_sessions is not None:
+        await cache.publish(_INVALIDATION_CHANNEL, {"i": _INSTANCE_ID, "k": telegram_id})
+
+
+def _observe_read(source: str, started: float) -> None:
+    _session_reads.inc(source=source)
+    _session_read_latency.observe(time.perf_counter() - started, source=source)
+
+
+def _read_stats() -> Dict[str, Any]:
+    """Session read mix: sources, fallback reasons, hit ratio, latency per source"""
+    sources = {dict(labels)["source"]: value for labels, value in _session_reads.items()}
+    total = sum(sources.values())
+    return {
+        "sources": sources,
+        "fallbacks": {dict(labels)["reason"]: value for labels, value in _session_fallbacks.items()},
+        "hit_ratio": (total - sources.get("supabase", 0)) / total if total else None,
+        "latency": {
+            labels["source"]: _session_read_latency.snapshot(**labels)
+            for labels in _session_read_latency.label_sets()
+        }
+    }
+
 
 class SessionManager:
     """
@@ -27,7 +337,10 @@ class SessionManager:
     Features:
     - Fast Redis cache for hot sessions (< 50ms)
     - Persistent Supabase storage for cold sessions
-    - Automatic cache invalidation (24h TTL)
+    - Write-through updates (no reload after update)
+    - Field-level data patches (Redis hash per session + jsonb ||)
+    - Sync or deferred (coalesced) Supabase writes
+    - Optional process-local L1 cache (pub/sub invalidation across instances)
     - Graceful fallback if Redis unavailable
     - Thread-safe async operations
 
@@ -42,66 +355,151 @@ class SessionManager:
         """Generate Redis cache key"""
         return f"session:{telegram_id}"
 
+    @staticmethod
+    async def _cache_session(
+        session_data: Dict[str, Any],
+        changed: bool = True,
+        token: Optional[int] = None
+    ) -> bool:
+        """
+        Write the whole session into Redis (write-through) and L1
+
+        Args:
+            session_data: Session dictionary
+            changed: Session was modified (other instances drop their L1 copy);
+                False for plain loads from Supabase
+            token: L1 fill token taken before the load (changed=False only)
+        """
+        cache = await get_redis_cache()
+        cache_key = SessionManager._get_cache_key(session_data["telegram_id"])
+        if cache and cache.is_connected(cache_key):
+            stored = await cache.replace_hash(
+                cache_key,
+                _session_to_hash(session_data),
+                ttl=SESSION_TIMEOUT_HOURS * 3600
+            )
+            if stored:
+                _local_store(session_data, token=None if changed else token)
+            elif _local_sessions is not None:
+                _local_sessions.invalidate(session_data["telegram_id"])
+            if changed:
+                await _publish_invalidation(cache, session_data["telegram_id"])
+            return stored
+        return False
+
+    @staticmethod
+    async def _cache_changes(telegram_id: int, changes: Dict[str, Any], expires_at) -> bool:
+        """Write only the changed fields into the cached session hash (if cached)"""
+        cache = await get_redis_cache()
+        if cache and cache.is_connected(SessionManager._get_cache_key(telegram_id)):
+            mapping, delete_fields = _changes_to_hash(changes)
+            mapping["expires_at"] = expires_at
+            updated = await cache.update_hash(
+                SessionManager._get_cache_key(telegram_id),
+                mapping,
+                ttl=SESSION_TIMEOUT_HOURS * 3600,
+                delete_fields=delete_fields
+            )
+            if updated:
+                _local_apply(telegram_id, changes, expires_at)
+            elif _local_sessions is not None:
+                _local_sessions.invalidate(telegram_id)
+            await _publish_invalidation(cache, telegram_id)
+            return updated
+        return False
+
     @staticmethod
     async def get_session(telegram_id: int) -> Dict[str, Any]:
         """
         Get session for telegram user (Redis → Supabase)
 
         Flow:
-        1. Try Redis cache (fast)
-        2. If miss → Load from Supabase
-        3. Store in Redis for next access
-        4. If expired → Create new session
+        1. Try process-local L1 cache (if enabled)
+        2. Try Redis cache (fast)
+        3. If miss → Load from Supabase, or create if missing/expired
+           (one upsert statement, race-free)
+        4. Store in Redis (and L1) for next access
         """
+        started = time.perf_counter()
         cache = await get_redis_cache()
         cache_key = SessionManager._get_cache_key(telegram_id)
 
-        # Try Redis first
-        if cache and cache.is_connected():
-            cached_session = await cache.get(cache_key)
+        # Try L1, then Redis
+        if cache and cache.is_connected(cache_key):
+            local_session = _local_get(telegram_id)
+            if local_session is not None:
+                logger.debug(f"✅ L1 HIT: session:{telegram_id}")
+                _observe_read("local", started)
+                return local_session
+
+            token = _local_begin_fill(telegram_id)
+            cached_session = _hash_to_session(await cache.hgetall(cache_key) or {})
             if cached_session:
                 logger.debug(f"✅ Redis HIT: session:{telegram_id}")
+                _local_store(cached_session, token=token)
+                _observe_read("redis", started)
                 return cached_session
+            _session_fallbacks.inc(reason="miss")
+        else:
+            _session_fallbacks.inc(reason="unavailable" if cache else "disabled")
 
-        # Redis miss → Load from Supabase
+        # Redis miss → Load (or create) in Supabase; concurrent misses
+        # for the same user share one load
         logger.debug(f"⚠️ Redis MISS: session:{telegram_id} → Loading from Supabase")
+        session_data = await _session_loads.do(
+            telegram_id, lambda: SessionManager._load_and_cache(telegram_id)
+        )
+        _observe_read("supabase", started)
+
+        # Every caller gets its own copy of the shared result
+        return copy.deepcopy(session_data)
+
+    @staticmethod
+    async def _load_and_cache(telegram_id: int) -> Dict[str, Any]:
+        """Load (or create) from Supabase and store in Redis for next access"""
+        token = _local_begin_fill(telegram_id)
+        session_data = await SessionManager._load_or_create(telegram_id)
+
+        if await SessionManager._cache_session(session_data, changed=False, token=token):
+            logger.debug(f"✅ Cached to Redis: session:{telegram_id}")
+
+        return session_data
+
+    @staticmethod
+    async def _load_or_create(telegram_id: int) -> Dict[str, Any]:
+        """
+        Load live session from Supabase or create a fresh one (single query)
 
+        Unflushed deferred writes are applied on top of a live row.
+        """
         pool = await get_pool()
         async with pool.acquire() as conn:
-            row = await conn.fetchrow("""
-                SELECT id, user_id, company_id, state, data, expires_at
-                FROM sessions
-                WHERE telegram_id = $1
-                  AND expires_at > NOW()
-            """, telegram_id)
-
-            if row:
-                # Session exists in Supabase
-                session_data = {
-                    "id": str(row['id']),
-                    "telegram_id": telegram_id,
-                    "user_id": str(row['user_id']) if row['user_id'] else None,
-                    "company_id": str(row['company_id']) if row['company_id'] else None,
-                    "state": row['state'],
-                    "data": row['data'] if row['data'] else {},
-                    "expires_at": row['expires_at']
-                }
-
-                # Store in Redis for next access
-                if cache and cache.is_connected():
-                    await cache.set(cache_key, session_data, ttl=SESSION_TIMEOUT_HOURS * 3600)
-                    logger.debug(f"✅ Cached to Redis: session:{telegram_id}")
-
-                return session_data
-            else:
-                # Session expired or not exists → Create new
-                return await SessionManager.create_session(telegram_id)
+            row = await conn.fetchrow(_GET_OR_CREATE_QUERY, telegram_id)
+            if row is None:
+                # Lost the insert race to a concurrent update: the row is live now
+                row = await conn.fetchrow(_GET_OR_CREATE_QUERY, telegram_id)
+
+        if row is None:
+            raise RuntimeError(f"Could not load or create session for {telegram_id}")
+
+        session_data = _row_to_session(telegram_id, row)
+        if row['created']:
+            # Expired or new session: older deferred changes no longer apply
+            _pending_writes.pop(telegram_id, None)
+            logger.debug(f"✅ New session created: session:{telegram_id}")
+        elif telegram_id in _pending_writes:
+            _apply_changes(session_data, _pending_writes[telegram_id])
+
+        return session_data
 
     @staticmethod
     async def create_session(telegram_id: int, **kwargs) -> Dict[str, Any]:
         """
         Create new session (write to both Redis + Supabase)
         """
+        # A fresh session supersedes anything waiting for flush
+        _pending_writes.pop(telegram_id, None)
+
         pool = await get_pool()
         async with pool.acquire() as conn:
             expires_at = datetime.utcnow() + timedelta(hours=SESSION_TIMEOUT_HOURS)
@@ -130,24 +528,13 @@ class SessionManager:
                 expires_at
             )
 
-            session_data = {
-                "id": str(row['id']),
-                "telegram_id": telegram_id,
-                "user_id": str(row['user_id']) if row['user_id'] else None,
-                "company_id": str(row['company_id']) if row['company_id'] else None,
-                "state": row['state'],
-                "data": row['data'] if row['data'] else {},
-                "expires_at": row['expires_at']
-            }
+        session_data = _row_to_session(telegram_id, row)
 
-            # Store in Redis
-            cache = await get_redis_cache()
-            if cache and cache.is_connected():
-                cache_key = SessionManager._get_cache_key(telegram_id)
-                await cache.set(cache_key, session_data, ttl=SESSION_TIMEOUT_HOURS * 3600)
-                logger.debug(f"✅ New session cached: session:{telegram_id}")
+        # Store in Redis
+        if await SessionManager._cache_session(session_data):
+            logger.debug(f"✅ New session cached: session:{telegram_id}")
 
-            return session_data
+        return session_data
 
     @staticmethod
     async def update_session(
@@ -155,58 +542,103 @@ class SessionManager:
         state: Optional[str] = None,
         data: Optional[Dict[str, Any]] = None,
         user_id: Optional[str] = None,
-        company_id: Optional[str] = None
+        company_id: Optional[str] = None,
+        durable: Optional[bool] = None,
+        data_patch: Optional[Dict[str, Any]] = None,
+        data_unset: Optional[Iterable[str]] = None
     ) -> None:
         """
-        Update session (invalidate Redis + update Supabase)
+        Update session (write-through to Redis)
+
+        Args:
+            telegram_id: User's Telegram ID
+            state, user_id, company_id: New values (None = unchanged)
+            data: Replace the whole data document
+            durable: True → write Supabase now, False → coalesce until next flush,
+                None → use SESSION_WRITE_MODE
+            data_patch: Set individual data keys (other keys untouched)
+            data_unset: Remove individual data keys
         """
+        changes: Dict[str, Any] = {}
+        if state is not None:
+            changes["state"] = state
+        if data is not None:
+            changes["data"] = data
+        if user_id is not None:
+            changes["user_id"] = user_id
+        if company_id is not None:
+            changes["company_id"] = company_id
+        if data_unset:
+            changes = _merge_changes(changes, {"data_unset": set(data_unset)})
+        if data_patch:
+            changes = _merge_changes(changes, {"data_patch": data_patch})
+
+        if not changes:
+            return
+
+        if durable is None:
+            durable = SESSION_WRITE_MODE != "deferred"
+
+        cache = await get_redis_cache()
+        if not durable and cache and cache.is_connected(SessionManager._get_cache_key(telegram_id)):
+            await SessionManager._update_deferred(telegram_id, changes)
+        else:
+            # Deferred writes need Redis as the source of truth until flushed
+            await SessionManager._update_sync(telegram_id, changes)
+
+    @staticmethod
+    async def _update_sync(telegram_id: int, changes: Dict[str, Any]) -> None:
+        """Write changes to Supabase now, then write them through to Redis"""
+        # Fold in older deferred changes so the next flush can't overwrite these
+        changes = _merge_changes(_pending_writes.pop(telegram_id, {}), changes)
+
         pool = await get_pool()
         async with pool.acquire() as conn:
-            updates = []
-            params = [telegram_id]
-            param_idx = 2
-
-            if state is not None:
-                updates.append(f"state = ${param_idx}")
-                params.append(state)
-                param_idx += 1
-
-            if data is not None:
-                updates.append(f"data = ${param_idx}::jsonb")
-                params.append(json.dumps(data))
-                param_idx += 1
-
-            if user_id is not None:
-                updates.append(f"user_id = ${param_idx}::uuid")
-                params.append(user_id)
-                param_idx += 1
-
-            if company_id is not None:
-                updates.append(f"company_id = ${param_idx}::uuid")
-                params.append(company_id)
-                param_idx += 1
-
-            if updates:
-                updates.append("updated_at = NOW()")
-                updates.append("expires_at = NOW() + INTERVAL '24 hours'")
-
-                query = f"""
-                    UPDATE sessions
-                    SET {', '.join(updates)}
-                    WHERE telegram_id = $1
-                """
-                await conn.execute(query, *params)
-
-                # Invalidate Redis cache (will be refreshed on next access)
-                cache = await get_redis_cache()
-                if cache and cache.is_connected():
-                    cache_key = SessionManager._get_cache_key(telegram_id)
-                    await cache.delete(cache_key)
-                    logger.debug(f"🗑️ Invalidated cache: session:{telegram_id}")
+            row = await conn.fetchrow(_WRITE_QUERY, *_write_params(telegram_id, changes))
+
+        if row is None:
+            # Session row is gone (expired and cleaned up): recreate it with the changes
+            session_data = _apply_changes({"data": {}}, changes)
+            await SessionManager.create_session(
+                telegram_id,
+                **{k: v for k, v in session_data.items() if k in ("state", "user_id", "company_id", "data")}
+            )
+            return
+
+        # Write-through: next get_session is a Redis hit
+        if "data" in changes:
+            session_data = _row_to_session(telegram_id, row, data=_apply_changes({}, changes)["data"])
+            cached = await SessionManager._cache_session(session_data)
+        else:
+            cached = await SessionManager._cache_changes(telegram_id, changes, row['expires_at'])
+        if cached:
+            logger.debug(f"✏️ Write-through: session:{telegram_id}")
+
+    @staticmethod
+    async def _update_deferred(telegram_id: int, changes: Dict[str, Any]) -> None:
+        """Write changes into Redis now and queue them for the next flush"""
+        expires_at = datetime.utcnow() + timedelta(hours=SESSION_TIMEOUT_HOURS)
+
+        if "data" in changes:
+            # Whole document replaced: rewrite the cached hash
+            session_data = _apply_changes(await SessionManager.get_session(telegram_id), changes)
+            session_data["expires_at"] = expires_at
+            await SessionManager._cache_session(session_data)
+        else:
+            # Not cached → nothing to do, pending changes are applied on next load
+            await SessionManager._cache_changes(telegram_id, changes, expires_at)
+
+        _pending_writes[telegram_id] = _merge_changes(_pending_writes.get(telegram_id, {}), changes)
+        _ensure_flush_task()
+        if len(_pending_writes) >= SESSION_FLUSH_MAX_PENDING and _flush_wakeup:
+            _flush_wakeup.set()
+        logger.debug(f"⏳ Deferred write queued: session:{telegram_id}")
 
     @staticmethod
     async def delete_session(telegram_id: int) -> None:
         """Delete session (from both Redis + Supabase)"""
+        _pending_writes.pop(telegram_id, None)
+
         # Delete from Supabase
         pool = await get_pool()
         async with pool.acquire() as conn:
@@ -215,65 +647,261 @@ class SessionManager:
                 telegram_id
             )
 
-        # Delete from Redis
+        # Delete from Redis (and every instance's L1)
+        if _local_sessions is not None:
+            _local_sessions.invalidate(telegram_id)
         cache = await get_redis_cache()
-        if cache and cache.is_connected():
-            cache_key = SessionManager._get_cache_key(telegram_id)
+        cache_key = SessionManager._get_cache_key(telegram_id)
+        if cache and cache.is_connected(cache_key):
             await cache.delete(cache_key)
+            await _publish_invalidation(cache, telegram_id)
             logger.debug(f"🗑️ Deleted session: session:{telegram_id}")
 
     @staticmethod
-    async def cleanup_expired_sessions() -> int:
+    async def cleanup_expired_sessions(batch_size: int = SESSION_CLEANUP_BATCH_SIZE) -> int:
         """
-        Remove expired sessions from Supabase
+        Remove expired sessions from Supabase in bounded batches
         Redis TTL handles cache expiration automatically
 
+        With Redis one bot instance sweeps at a time (the others return 0)
+        and the sweep stops as soon as its lock is lost. Without Redis only
+        single batches are serialized across instances (a transaction-scoped
+        advisory lock: the transaction pooler cannot hold a session lock
+        across batches), so sweeps of two instances may interleave. That is
+        accepted: every batch deletes only expired rows, so the instances
+        just share the work.
+
+        Args:
+            batch_size: Max rows deleted per batch (one short transaction each)
+
         Returns:
             Number of deleted sessions
+
+        Raises:
+            ValueError: batch_size below 1
         """
-        pool = await get_pool()
-        async with pool.acquire() as conn:
-            result = await conn.fetch("""
-                DELETE FROM sessions
-                WHERE expires_at < NOW()
-                RETURNING id
-            """)
-            deleted_count = len(result)
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
 
-            if deleted_count > 0:
-                logger.info(f"🧹 Cleaned up {deleted_count} expired sessions from Supabase")
+        cache = await get_redis_cache()
+        token = None
+        if cache and cache.is_connected(_CLEANUP_LOCK_KEY):
+            token = await cache.acquire_lock(_CLEANUP_LOCK_KEY, _CLEANUP_LOCK_TTL)
+            if token is None:
+                _cleanup_runs.inc(result="skipped")
+                logger.debug("🧹 Session cleanup running on another instance, skipping")
+                return 0
+
+        started = time.monotonic()
+        deleted_count = 0
+        batches = 0
+        try:
+            pool = await get_pool()
+            while True:
+                async with pool.acquire() as conn:
+                    async with conn.transaction():
+                        if token is None:
+                            is_leader = await conn.fetchval(
+                                "SELECT pg_try_advisory_xact_lock($1)",
+                                _CLEANUP_ADVISORY_LOCK_ID
+                            )
+                            if not is_leader:
+                                break
+                        status = await conn.execute(_CLEANUP_BATCH_QUERY, batch_size)
+
+                # Status is "DELETE <count>": only a count crosses the wire
+                batch_deleted = int(status.split()[-1])
+                deleted_count += batch_deleted
+                batches += 1
+                if batch_deleted < batch_size:
+                    break
+
+                if token is not None and not await cache.extend_lock(_CLEANUP_LOCK_KEY, token, _CLEANUP_LOCK_TTL):
+                    # Lock expired or taken over: leave the rest to the new holder
+                    logger.warning("⚠️ Session cleanup lock lost, stopping sweep")
+                    break
+                await asyncio.sleep(0)
+        finally:
+            if token is not None:
+                await cache.release_lock(_CLEANUP_LOCK_KEY, token)
+
+        elapsed = time.monotonic() - started
+        _cleanup_rows.inc(deleted_count)
+        _cleanup_duration.observe(elapsed)
+        _cleanup_runs.inc(result="swept" if batches else "skipped")
+
+        if deleted_count > 0:
+            logger.info(
+                f"🧹 Cleaned up {deleted_count} expired sessions from Supabase "
+                f"({batches} batches, {elapsed:.2f}s)"
+            )
 
-            return deleted_count
+        return deleted_count
 
     @staticmethod
     async def set_session_field(telegram_id: int, field: str, value: Any) -> None:
-        """Set a specific field in session data"""
-        current_session = await SessionManager.get_session(telegram_id)
-        data = current_session.get("data", {})
-        data[field] = value
-        await SessionManager.update_session(telegram_id, data=data)
+        """Set a specific field in session data (patches only this key)"""
+        await SessionManager.update_session(telegram_id, data_patch={field: value})
+
+    @staticmethod
+    async def delete_session_field(telegram_id: int, field: str) -> None:
+        """Remove a specific field from session data"""
+        await SessionManager.update_session(telegram_id, data_unset=[field])
 
     @staticmethod
     async def get_session_field(telegram_id: int, field: str, default: Any = None) -> Any:
-        """Get a specific field from session data"""
+        """Get a specific field from session data (L1, or single HMGET when cached)"""
+        cache = await get_redis_cache()
+        cache_key = SessionManager._get_cache_key(telegram_id)
+        if cache and cache.is_connected(cache_key):
+            local_session = _local_active and _local_sessions.get(telegram_id)
+            if local_session:
+                return copy.deepcopy(local_session["data"].get(field, default))
+
+            values = await cache.hmget(cache_key, ["telegram_id", _DATA_PREFIX + field])
+            if values and values[0] is not None:
+                return default if values[1] is None else values[1]
+
         current_session = await SessionManager.get_session(telegram_id)
         return current_session.get("data", {}).get(field, default)
 
+    @staticmethod
+    async def count_cached_sessions() -> int:
+        """Count sessions currently cached in Redis (streaming SCAN)"""
+        cache = await get_redis_cache()
+        if not cache or not cache.is_connected():
+            return 0
+        return await cache.count_keys("session:*", key_type="hash")
+
     @staticmethod
     async def get_cache_stats() -> Dict[str, Any]:
         """
         Get cache statistics
 
         Returns:
-            Dictionary with Redis stats or error
+            Dictionary with Redis stats (server INFO, client-side per-namespace
+            counters/latency) and session read mix, or error
         """
         cache = await get_redis_cache()
         if not cache or not cache.is_connected():
             return {
                 "enabled": False,
-                "message": "Redis cache disabled or disconnected"
+                "message": "Redis cache disabled or disconnected",
+                "reads": _read_stats()
             }
 
         stats = await cache.get_stats()
         stats["enabled"] = True
+        stats["client"] = cache.get_client_stats("session")
+        stats["reads"] = _read_stats()
+        stats["write_mode"] = SESSION_WRITE_MODE
+        stats["pending_writes"] = len(_pending_writes)
+        stats["inflight_loads"] = _session_loads.inflight()
+        if _local_sessions is not None:
+            stats["local_cache"] = dict(_local_sessions.get_stats(), active=_local_active)
         return stats
+
+
+async def init_session_local_cache() -> bool:
+    """
+    Enable the process-local L1 session cache (SESSION_LOCAL_CACHE_ENABLED)
+
+    Needs Redis for cross-instance invalidation; the subscription is
+    re-established after Redis outages and stopped by close_redis_cache().
+
+    Returns:
+        True if enabled
+    """
+    global _local_sessions
+    if not SESSION_LOCAL_CACHE_ENABLED:
+        return False
+
+    cache = await get_redis_cache()
+    if cache is None:
+        logger.warning("⚠️ Local session cache needs Redis for invalidation, disabled")
+        return False
+
+    if _local_sessions is None:
+        _local_sessions = LocalCache(SESSION_LOCAL_CACHE_SIZE, SESSION_LOCAL_CACHE_TTL)
+        cache.subscribe(_INVALIDATION_CHANNEL, _on_invalidation, _on_subscription_state)
+        logger.info(
+            f"✅ Local session cache: {SESSION_LOCAL_CACHE_SIZE} entries, "
+            f"{SESSION_LOCAL_CACHE_TTL:g}s TTL"
+        )
+    return True
+
+
+async def flush_pending_sessions() -> int:
+    """
+    Persist coalesced deferred writes to Supabase in one round-trip
+
+    Returns:
+        Number of sessions written
+    """
+    if not _pending_writes:
+        return 0
+
+    batch = dict(_pending_writes)
+    _pending_writes.clear()
+
+    rows = [_write_params(telegram_id, changes) for telegram_id, changes in batch.items()]
+
+    try:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.executemany(_WRITE_QUERY, rows)
+    except BaseException:
+        # Re-queue (also when cancelled mid-write) without clobbering changes
+        # that arrived during the flush
+        for telegram_id, changes in batch.items():
+            _pending_writes[telegram_id] = _merge_changes(changes, _pending_writes.get(telegram_id, {}))
+        raise
+
+    logger.debug(f"💾 Flushed {len(rows)} deferred session writes")
+    return len(rows)
+
+
+async def _flush_loop():
+    """Flush deferred writes every SESSION_FLUSH_INTERVAL (or earlier when full)"""
+    while not _flush_stopping:
+        try:
+            await asyncio.wait_for(_flush_wakeup.wait(), timeout=SESSION_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _flush_wakeup.clear()
+        if _flush_stopping:
+            break
+
+        try:
+            await flush_pending_sessions()
+        except Exception as e:
+            logger.error(f"❌ Error flushing session writes: {e}")
+
+
+def _ensure_flush_task():
+    """Start the background flusher on first deferred write"""
+    global _flush_task, _flush_wakeup
+    if _flush_stopping:
+        # Shutting down: close_session_writer() flushes what is left
+        return
+    if _flush_task is None or _flush_task.done():
+        _flush_wakeup = asyncio.Event()
+        _flush_task = asyncio.create_task(_flush_loop())
+
+
+async def close_session_writer():
+    """Stop the background flusher and persist everything still pending"""
+    global _flush_task, _flush_stopping
+    _flush_stopping = True
+    if _flush_task:
+        # Not cancelled: a flush in progress finishes its write first
+        _flush_wakeup.set()
+        await asyncio.gather(_flush_task, return_exceptions=True)
+        _flush_task = None
+
+    try:
+        flushed = await flush_pending_sessions()
+        if flushed:
+            logger.info(f"💾 Flushed {flushed} pending session writes on shutdown")
+    except Exception as e:
+        logger.error(f"❌ Error flushing session writes on shutdown: {e}")
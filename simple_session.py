@@ -1,45 +1,352 @@
 """
 Simple In-Memory Session Manager (Fallback)
 Uses dictionary for session storage when database is unavailable
+
+Storage layout:
+- Compact slotted records with monotonic integer expiry (seconds)
+- Min-heap expiry index: cleanup cost ~ number of expired sessions
+- Hard cap on session count with LRU eviction
+- Optional crash-safe persistence: append-only log + periodic snapshot
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterable, List, Tuple
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import asyncio
+import copy
+import heapq
+import json
 import logging
+import mmap
+import os
+import time
+
+from bot.config import (
+    SESSION_TIMEOUT_HOURS,
+    SIMPLE_SESSION_MAX_ENTRIES,
+    SESSION_SNAPSHOT_INTERVAL,
+    SESSION_PERSIST_FSYNC
+)
 
 logger = logging.getLogger(__name__)
 
-# In-memory session storage
-_sessions: Dict[int, Dict[str, Any]] = {}
+SESSION_TIMEOUT_SECONDS = SESSION_TIMEOUT_HOURS * 3600
+
+# Yield to the event loop every N expired sessions during cleanup
+_CLEANUP_BATCH = 1000
+
+
+def _now() -> int:
+    """Monotonic clock in whole seconds"""
+    return int(time.monotonic())
+
+
+class _SessionRecord:
+    """Compact session record (no per-instance __dict__)"""
+
+    __slots__ = (
+        "telegram_id", "user_id", "company_id", "state", "data",
+        "created_at", "expires_at", "heap_at"
+    )
+
+    def __init__(
+        self,
+        telegram_id: int,
+        user_id: Optional[str] = None,
+        company_id: Optional[str] = None,
+        state: str = "MENU",
+        data: Optional[Dict[str, Any]] = None
+    ):
+        now = _now()
+        self.telegram_id = telegram_id
+        self.user_id = user_id
+        self.company_id = company_id
+        self.state = state
+        self.data = data if data is not None else {}
+        self.created_at = now
+        self.expires_at = now + SESSION_TIMEOUT_SECONDS
+        self.heap_at = 0  # time of this record's entry in the expiry heap
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Session dictionary in the same shape as SessionManager returns
+
+        `data` is a deep copy: changes must go through update_session (journal, LRU)
+        """
+        now_mono = _now()
+        now_wall = datetime.utcnow()
+        return {
+            "telegram_id": self.telegram_id,
+            "user_id": self.user_id,
+            "company_id": self.company_id,
+            "state": self.state,
+            "data": copy.deepcopy(self.data),
+            "created_at": now_wall - timedelta(seconds=now_mono - self.created_at),
+            "expires_at": now_wall + timedelta(seconds=self.expires_at - now_mono)
+        }
+
+
+# In-memory session storage (insertion/access order = LRU order)
+_sessions: "OrderedDict[int, _SessionRecord]" = OrderedDict()
+
+# Expiry index: (scheduled_at, telegram_id). One live entry per record;
+# entries of replaced/evicted records are skipped when popped.
+_expiry_heap: List[Tuple[int, int]] = []
+
+
+class SessionJournal:
+    """
+    Append-only log + snapshot persistence for the in-memory store
+
+    Files in the persistence directory:
+    - sessions.snapshot: one JSON record per line (loaded via mmap)
+    - sessions.aof: one JSON operation per line, appended on every change
+    - sessions.aof.old: log being folded into a snapshot (exists only mid-snapshot)
+
+    Expiry is stored as wall-clock epoch seconds, so it survives restarts.
+    Every "set" entry carries the full record, which makes replay idempotent.
+    """
+
+    SNAPSHOT_FILE = "sessions.snapshot"
+    LOG_FILE = "sessions.aof"
+    OLD_LOG_FILE = "sessions.aof.old"
+
+    def __init__(self, directory: str, fsync: str = "everysec"):
+        """
+        Args:
+            directory: Directory for snapshot and log files
+            fsync: "always" (every write), "everysec" (background) or "no" (OS decides)
+        """
+        self.directory = directory
+        self.fsync = fsync
+        self._log = None
+        self._dirty = False
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def encode(record: _SessionRecord) -> Dict[str, Any]:
+        """Record → JSON-serializable entry"""
+        return {
+            "op": "set",
+            "id": record.telegram_id,
+            "u": record.user_id,
+            "c": record.company_id,
+            "s": record.state,
+            "d": record.data,
+            "e": time.time() + (record.expires_at - _now())
+        }
+
+    @staticmethod
+    def _apply(entry: Dict[str, Any], wall_now: float, mono_now: int) -> None:
+        """Apply one snapshot/log entry to the store (no logging)"""
+        if entry.get("op") == "del":
+            _sessions.pop(entry["id"], None)
+            return
+
+        remaining = int(entry["e"] - wall_now)
+        if remaining <= 0:
+            _sessions.pop(entry["id"], None)
+            return
+
+        record = _SessionRecord(
+            entry["id"],
+            user_id=entry.get("u"),
+            company_id=entry.get("c"),
+            state=entry.get("s", "MENU"),
+            data=entry.get("d") or {}
+        )
+        record.expires_at = mono_now + remaining
+        _store(record, log=False)
+
+    def load(self) -> int:
+        """
+        Restore the store: snapshot, then pending logs in write order
+
+        Returns:
+            Number of sessions restored
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        wall_now, mono_now = time.time(), _now()
+
+        snapshot_path = self._path(self.SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path) and os.path.getsize(snapshot_path) > 0:
+            with open(snapshot_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for line in iter(mm.readline, b""):
+                        self._apply(json.loads(line), wall_now, mono_now)
+
+        for name in (self.OLD_LOG_FILE, self.LOG_FILE):
+            path = self._path(name)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last write from a crash: everything before it is valid
+                        logger.warning(f"⚠️ Skipping truncated entry in {name}")
+                        break
+                    self._apply(entry, wall_now, mono_now)
+
+        return len(_sessions)
+
+    def open(self):
+        """Open the append-only log for writing"""
+        self._log = open(self._path(self.LOG_FILE), "ab")
+
+    def append(self, entry: Dict[str, Any]):
+        """Append one operation (flushed to the OS immediately)"""
+        if self._log is None:
+            return
+        self._log.write(json.dumps(entry, separators=(",", ":"), default=str).encode() + b"\n")
+        self._log.flush()
+        if self.fsync == "always":
+            os.fsync(self._log.fileno())
+        else:
+            self._dirty = True
+
+    def sync(self):
+        """fsync pending log writes (used by the everysec policy)"""
+        if self._log is not None and self._dirty:
+            os.fsync(self._log.fileno())
+            self._dirty = False
+
+    async def snapshot(self) -> int:
+        """
+        Write a snapshot and drop the log it replaces
+
+        The log is rotated first, so changes made while the snapshot is being
+        written land in the new log and win on replay.
+
+        Returns:
+            Number of sessions written
+        """
+        if self._log is None:
+            return 0
+
+        # 1. Rotate the log (synchronous: no change can slip between the two files)
+        self.sync()
+        self._log.close()
+        log_path, old_log_path = self._path(self.LOG_FILE), self._path(self.OLD_LOG_FILE)
+        if os.path.exists(old_log_path):
+            # Previous snapshot failed: keep its log, append ours after it
+            with open(old_log_path, "ab") as old_log, open(log_path, "rb") as log:
+                old_log.write(log.read())
+                old_log.flush()
+                os.fsync(old_log.fileno())
+            os.remove(log_path)
+        else:
+            os.replace(log_path, old_log_path)
+        self.open()
+
+        # 2. Serialize in chunks, yielding to the event loop between them
+        records = list(_sessions.values())
+        lines = []
+        for i, record in enumerate(records, 1):
+            lines.append(json.dumps(self.encode(record), separators=(",", ":"), default=str))
+            if i % _CLEANUP_BATCH == 0:
+                await asyncio.sleep(0)
 
-SESSION_TIMEOUT_HOURS = 24
+        # 3. Write + fsync + atomic rename off the event loop, then drop the old log
+        await asyncio.to_thread(self._write_snapshot, lines)
+        return len(lines)
+
+    def _write_snapshot(self, lines: List[str]):
+        tmp_path = self._path(self.SNAPSHOT_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line)
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(self.SNAPSHOT_FILE))
+        os.remove(self._path(self.OLD_LOG_FILE))
+
+    def close(self):
+        """Sync and close the log"""
+        if self._log is not None:
+            self.sync()
+            self._log.close()
+            self._log = None
+
+
+# Persistence (disabled unless init_session_persistence() is called)
+_journal: Optional[SessionJournal] = None
+_persistence_task: Optional[asyncio.Task] = None
+_persistence_stop: Optional[asyncio.Event] = None
+
+
+def _log_set(record: _SessionRecord):
+    if _journal is not None:
+        _journal.append(SessionJournal.encode(record))
+
+
+def _log_delete(telegram_id: int):
+    if _journal is not None:
+        _journal.append({"op": "del", "id": telegram_id})
+
+
+def _schedule(record: _SessionRecord):
+    """Add the record to the expiry index"""
+    record.heap_at = record.expires_at
+    heapq.heappush(_expiry_heap, (record.heap_at, record.telegram_id))
+
+
+def _store(record: _SessionRecord, log: bool = True):
+    """Insert or replace a record, evicting least recently used over the cap"""
+    _sessions[record.telegram_id] = record
+    _sessions.move_to_end(record.telegram_id)
+    _schedule(record)
+    if log:
+        _log_set(record)
+
+    while len(_sessions) > SIMPLE_SESSION_MAX_ENTRIES:
+        evicted_id, _ = _sessions.popitem(last=False)
+        if log:
+            _log_delete(evicted_id)
+        logger.debug(f"♻️ Evicted LRU session for {evicted_id}")
+
+    # Drop stale heap entries if evictions/replacements left too many behind
+    if len(_expiry_heap) > 2 * len(_sessions) + 1024:
+        _expiry_heap[:] = [(rec.heap_at, tid) for tid, rec in _sessions.items()]
+        heapq.heapify(_expiry_heap)
+
+
+def _touch(record: _SessionRecord):
+    """Extend expiry (the heap entry is rescheduled lazily during cleanup)"""
+    record.expires_at = _now() + SESSION_TIMEOUT_SECONDS
+    _log_set(record)
 
 
 class SimpleSessionManager:
     """Simple session manager using in-memory storage"""
 
     @staticmethod
-    async def get_session(telegram_id: int) -> Dict[str, Any]:
-        """Get or create session"""
-        if telegram_id not in _sessions:
-            _sessions[telegram_id] = {
-                "telegram_id": telegram_id,
-                "user_id": None,
-                "company_id": None,
-                "state": "MENU",
-                "data": {},
-                "created_at": datetime.utcnow(),
-                "expires_at": datetime.utcnow() + timedelta(hours=SESSION_TIMEOUT_HOURS)
-            }
+    def _get_record(telegram_id: int) -> _SessionRecord:
+        """Get or create the session record"""
+        record = _sessions.get(telegram_id)
+        if record is None:
+            record = _SessionRecord(telegram_id)
+            _store(record)
             logger.debug(f"✅ Created new session for {telegram_id}")
+            return record
+
+        _sessions.move_to_end(telegram_id)
 
         # Check expiration
-        session = _sessions[telegram_id]
-        if session["expires_at"] < datetime.utcnow():
+        if record.expires_at < _now():
             # Renew expired session
-            session["expires_at"] = datetime.utcnow() + timedelta(hours=SESSION_TIMEOUT_HOURS)
+            _touch(record)
             logger.debug(f"🔄 Renewed expired session for {telegram_id}")
 
-        return session
+        return record
+
+    @staticmethod
+    async def get_session(telegram_id: int) -> Dict[str, Any]:
+        """Get or create session"""
+        return SimpleSessionManager._get_record(telegram_id).to_dict()
 
     @staticmethod
     async def update_session(
@@ -47,21 +354,28 @@ class SimpleSessionManager:
         state: Optional[str] = None,
         data: Optional[Dict[str, Any]] = None,
         user_id: Optional[str] = None,
-        company_id: Optional[str] = None
+        company_id: Optional[str] = None,
+        durable: Optional[bool] = None,
+        data_patch: Optional[Dict[str, Any]] = None,
+        data_unset: Optional[Iterable[str]] = None
     ) -> None:
-        """Update session"""
-        session = await SimpleSessionManager.get_session(telegram_id)
+        """Update session (durable is accepted for SessionManager compatibility)"""
+        record = SimpleSessionManager._get_record(telegram_id)
 
         if state is not None:
-            session["state"] = state
+            record.state = state
         if data is not None:
-            session["data"] = data
+            record.data = data
+        for key in data_unset or ():
+            record.data.pop(key, None)
+        if data_patch:
+            record.data.update(data_patch)
         if user_id is not None:
-            session["user_id"] = user_id
+            record.user_id = user_id
         if company_id is not None:
-            session["company_id"] = company_id
+            record.company_id = company_id
 
-        session["expires_at"] = datetime.utcnow() + timedelta(hours=SESSION_TIMEOUT_HOURS)
+        _touch(record)
         logger.debug(f"✏️ Updated session for {telegram_id}")
 
     @staticmethod
@@ -69,34 +383,125 @@ class SimpleSessionManager:
         """Delete session"""
         if telegram_id in _sessions:
             del _sessions[telegram_id]
+            _log_delete(telegram_id)
             logger.debug(f"🗑️ Deleted session for {telegram_id}")
 
     @staticmethod
     async def cleanup_expired_sessions() -> int:
-        """Remove expired sessions"""
-        now = datetime.utcnow()
-        expired = [tid for tid, sess in _sessions.items() if sess["expires_at"] < now]
+        """
+        Remove expired sessions
+
+        Pops only heap entries that are due, so the cost is proportional to
+        the number of expired (or since-refreshed) sessions, not to all sessions.
+        """
+        now = _now()
+        expired = 0
+        processed = 0
+
+        while _expiry_heap and _expiry_heap[0][0] <= now:
+            scheduled_at, tid = heapq.heappop(_expiry_heap)
+            processed += 1
 
-        for tid in expired:
-            del _sessions[tid]
+            record = _sessions.get(tid)
+            if record is None or record.heap_at != scheduled_at:
+                continue  # deleted, evicted or replaced since scheduling
+
+            if record.expires_at <= now:
+                del _sessions[tid]
+                expired += 1
+            else:
+                _schedule(record)  # refreshed since scheduling
+
+            if processed % _CLEANUP_BATCH == 0:
+                await asyncio.sleep(0)
+                now = _now()
 
         if expired:
-            logger.info(f"🧹 Cleaned up {len(expired)} expired sessions")
+            logger.info(f"🧹 Cleaned up {expired} expired sessions")
 
-        return len(expired)
+        return expired
 
     @staticmethod
     async def create_session(telegram_id: int, **kwargs) -> Dict[str, Any]:
         """Create new session"""
-        session = {
-            "telegram_id": telegram_id,
-            "user_id": kwargs.get("user_id"),
-            "company_id": kwargs.get("company_id"),
-            "state": kwargs.get("state", "MENU"),
-            "data": kwargs.get("data", {}),
-            "created_at": datetime.utcnow(),
-            "expires_at": datetime.utcnow() + timedelta(hours=SESSION_TIMEOUT_HOURS)
-        }
-        _sessions[telegram_id] = session
+        record = _SessionRecord(
+            telegram_id,
+            user_id=kwargs.get("user_id"),
+            company_id=kwargs.get("company_id"),
+            state=kwargs.get("state", "MENU"),
+            data=kwargs.get("data", {})
+        )
+        _store(record)
         logger.debug(f"✅ Created session for {telegram_id}")
-        return session
+        return record.to_dict()
+
+
+async def _persistence_loop():
+    """fsync the log every second and snapshot every SESSION_SNAPSHOT_INTERVAL"""
+    last_snapshot = time.monotonic()
+    while not _persistence_stop.is_set():
+        try:
+            await asyncio.wait_for(_persistence_stop.wait(), timeout=1)
+            break
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            if SESSION_PERSIST_FSYNC == "everysec":
+                _journal.sync()
+            if time.monotonic() - last_snapshot >= SESSION_SNAPSHOT_INTERVAL:
+                count = await _journal.snapshot()
+                last_snapshot = time.monotonic()
+                logger.debug(f"💾 Session snapshot written ({count} sessions)")
+        except Exception as e:
+            logger.error(f"❌ Session persistence error: {e}")
+
+
+async def init_session_persistence(directory: Optional[str]) -> int:
+    """
+    Restore sessions from disk and start logging changes
+
+    Args:
+        directory: Persistence directory or None to keep sessions in memory only
+
+    Returns:
+        Number of restored sessions
+    """
+    global _journal, _persistence_task, _persistence_stop
+
+    if not directory:
+        logger.info("Session persistence disabled (no SESSION_PERSIST_DIR provided)")
+        return 0
+
+    journal = SessionJournal(directory, fsync=SESSION_PERSIST_FSYNC)
+    started = time.monotonic()
+    restored = journal.load()
+    journal.open()
+    _journal = journal
+
+    # Fold the replayed log into a fresh snapshot so the next start is a pure mmap load
+    await journal.snapshot()
+    _persistence_stop = asyncio.Event()
+    _persistence_task = asyncio.create_task(_persistence_loop())
+
+    logger.info(f"✅ Restored {restored} sessions in {time.monotonic() - started:.2f}s")
+    return restored
+
+
+async def close_session_persistence():
+    """Write a final snapshot and close the log"""
+    global _journal, _persistence_task
+
+    if _persistence_task:
+        # Let a snapshot in progress finish instead of cancelling it mid-write
+        _persistence_stop.set()
+        await _persistence_task
+        _persistence_task = None
+
+    if _journal:
+        try:
+            await _journal.snapshot()
+        except Exception as e:
+            logger.error(f"❌ Error writing final session snapshot: {e}")
+        _journal.close()
+        _journal = None
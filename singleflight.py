@@ -0,0 +1,78 @@
+"""
+Single-flight request coalescing for DrAivBot
+Concurrent calls for the same key share one in-flight load
+
+Usage:
+    from bot.core.singleflight import SingleFlight
+
+    _user_loads = SingleFlight("users")
+
+    user = await _user_loads.do(telegram_id, lambda: _fetch_user(telegram_id))
+
+Only concurrent callers are coalesced: the result is not cached, the key is
+released as soon as the load finishes (successfully or not). Callers receive
+the same object, so mutable results must be copied by the caller.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from bot.core.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_coalesced = REGISTRY.counter(
+    "singleflight_coalesced_total", "Calls served by another caller's in-flight load", ["group"]
+)
+_loads = REGISTRY.counter(
+    "singleflight_loads_total", "Loads actually executed", ["group"]
+)
+
+
+class SingleFlight:
+    """
+    Per-key in-flight call deduplication
+
+    Args:
+        name: Group name (metrics label)
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() once for all concurrent callers with the same key
+
+        The load runs in its own task and is shielded: a cancelled caller
+        (e.g. a timed-out handler) does not cancel the load for the others.
+
+        Args:
+            key: Coalescing key (e.g. telegram_id)
+            fn: Zero-argument coroutine factory
+
+        Returns:
+            fn() result (exceptions are propagated to every waiter)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            _loads.inc(group=self.name)
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            _coalesced.inc(group=self.name)
+            logger.debug(f"🔁 Coalesced {self.name}:{key}")
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved: waiters may all have been cancelled
+
+    def inflight(self) -> int:
+        """Number of keys currently loading"""
+        return len(self._inflight)
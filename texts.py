@@ -49,6 +49,9 @@ TEXTS = {
         "error_generic": "❌ Произошла ошибка. Попробуйте позже.",
         "error_no_company": "❌ Компания не найдена",
         "error_no_permission": "❌ Недостаточно прав доступа",
+
+        # Reminders
+        "event_reminder": "⏰ Напоминание: {title}\n🕐 {time} (через {minutes} мин)",
     },
 
     "en": {
@@ -96,6 +99,9 @@ TEXTS = {
         "error_generic": "❌ An error occurred. Please try again later.",
         "error_no_company": "❌ Company not found",
         "error_no_permission": "❌ Insufficient permissions",
+
+        # Reminders
+        "event_reminder": "⏰ Reminder: {title}\n🕐 {time} (in {minutes} min)",
     }
 }
 